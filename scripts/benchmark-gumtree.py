@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Measures the time taken by the top-down phase of GumTree on deep programs and many identical blocks."""
+from __future__ import annotations
+
+import timeit
+import typing as t
+
+from loguru import logger
+
+from facilitate.gumtree import HeightIndexedPriorityList, compute_gumtree_mappings, compute_topdown_mappings
+from facilitate.loader import load_program_from_block_descriptions
+
+if t.TYPE_CHECKING:
+    from facilitate.model.program import Program
+
+DEPTHS = (10, 50, 100, 150)
+LENGTHS = (10, 50, 100, 200)
+NUM_REPEATS = 3
+NUM_RUNS = 5
+
+
+def build_nested_program(depth: int, steps: int) -> Program:
+    """Builds a program that consists of a tower of nested repeat blocks with a move block on each level."""
+    descriptions: dict[str, dict[str, t.Any]] = {}
+    for level in range(depth):
+        repeat_id = f"repeat-{level}"
+        move_id = f"move-{level}"
+        parent_id = f"repeat-{level - 1}" if level > 0 else None
+        inputs: dict[str, t.Any] = {"TIMES": [1, [4, "10"]]}
+        if level + 1 < depth:
+            inputs["SUBSTACK"] = [2, f"repeat-{level + 1}"]
+        descriptions[repeat_id] = {
+            "opcode": "control_repeat",
+            "next": move_id,
+            "parent": parent_id,
+            "inputs": inputs,
+            "fields": {},
+            "shadow": False,
+            "topLevel": level == 0,
+        }
+        descriptions[move_id] = {
+            "opcode": "motion_movesteps",
+            "next": None,
+            "parent": repeat_id,
+            "inputs": {"STEPS": [1, [4, str(steps if level == depth - 1 else 10)]]},
+            "fields": {},
+            "shadow": False,
+            "topLevel": False,
+        }
+    return load_program_from_block_descriptions(descriptions)
+
+
+def build_flat_program(length: int) -> Program:
+    """Builds a program that consists of a single sequence of identical move blocks."""
+    descriptions: dict[str, dict[str, t.Any]] = {}
+    for position in range(length):
+        descriptions[f"move-{position}"] = {
+            "opcode": "motion_movesteps",
+            "next": f"move-{position + 1}" if position + 1 < length else None,
+            "parent": f"move-{position - 1}" if position > 0 else None,
+            "inputs": {"STEPS": [1, [4, "10"]]},
+            "fields": {},
+            "shadow": False,
+            "topLevel": position == 0,
+        }
+    return load_program_from_block_descriptions(descriptions)
+
+
+def time_topdown_mappings(tree_from: Program, tree_to: Program) -> float:
+    """Returns the best time taken to compute the top-down mappings between two programs, in milliseconds."""
+    timings = timeit.repeat(
+        lambda: compute_topdown_mappings(tree_from, tree_to),
+        repeat=NUM_REPEATS,
+        number=NUM_RUNS,
+    )
+    return min(timings) / NUM_RUNS * 1000
+
+
+def time_gumtree_mappings(tree_from: Program, tree_to: Program, *, match_ids: bool) -> float:
+    """Returns the best time taken to compute the GumTree mappings between two programs, in milliseconds."""
+    timings = timeit.repeat(
+        lambda: compute_gumtree_mappings(tree_from, tree_to, match_ids=match_ids),
+        repeat=NUM_REPEATS,
+        number=NUM_RUNS,
+    )
+    return min(timings) / NUM_RUNS * 1000
+
+
+def main() -> None:
+    logger.remove()
+
+    for depth in DEPTHS:
+        # the two programs differ only at their deepest level
+        tree_from = build_nested_program(depth, steps=10)
+        tree_to = build_nested_program(depth, steps=20)
+        nodes = list(tree_from.nodes())
+
+        def push_and_pop_all(nodes: list = nodes) -> None:  # type: ignore[type-arg]
+            hlist = HeightIndexedPriorityList()
+            for node in nodes:
+                hlist.push(node)
+            while hlist.max_height > 0:
+                hlist.pop()
+
+        hlist_timings = timeit.repeat(push_and_pop_all, repeat=NUM_REPEATS, number=NUM_RUNS)
+        hlist_ms = min(hlist_timings) / NUM_RUNS * 1000
+        topdown_ms = time_topdown_mappings(tree_from, tree_to)
+        print(
+            f"depth {depth} (height {tree_from.height}, {len(nodes)} nodes): "
+            f"priority list {hlist_ms:.3f} ms, top-down mappings {topdown_ms:.3f} ms",
+        )
+
+    for length in LENGTHS:
+        # every block in one program is a candidate match for every block in the other program
+        tree_from = build_flat_program(length)
+        tree_to = build_flat_program(length + 1)
+        topdown_ms = time_topdown_mappings(tree_from, tree_to)
+        print(f"{length} identical blocks: top-down mappings {topdown_ms:.3f} ms")
+
+        # the two programs are also successive snapshots of the same program (i.e., share block IDs)
+        gumtree_ms = time_gumtree_mappings(tree_from, tree_to, match_ids=False)
+        matched_ids_ms = time_gumtree_mappings(tree_from, tree_to, match_ids=True)
+        print(
+            f"{length} identical blocks: gumtree mappings {gumtree_ms:.3f} ms"
+            f" ({matched_ids_ms:.3f} ms with matched IDs)",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Measures the time taken to import the server (e.g., during a cold start on AWS Lambda)."""
+import statistics
+import subprocess
+import sys
+
+MODULE = "facilitate.server"
+NUM_RUNS = 10
+
+# these dependencies are only needed for visualization and should not be loaded by the server
+VISUALIZATION_MODULES = ("networkx", "PIL.Image", "pydot")
+
+PROGRAM = f"""
+import sys
+import time
+
+start = time.perf_counter()
+import {MODULE}
+duration = time.perf_counter() - start
+
+loaded = [name for name in {VISUALIZATION_MODULES!r} if name in sys.modules]
+print(duration, ",".join(loaded))
+"""
+
+
+def main() -> None:
+    durations: list[float] = []
+    loaded_modules = ""
+
+    # each import is measured in a fresh interpreter so that no modules are cached
+    for _ in range(NUM_RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", PROGRAM],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.split()
+        durations.append(float(output[0]))
+        loaded_modules = output[1] if len(output) > 1 else ""
+
+    median_ms = statistics.median(durations) * 1000
+    print(f"import {MODULE}: {median_ms:.1f} ms (median of {NUM_RUNS} runs)")
+    print(f"visualization modules loaded: {loaded_modules or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
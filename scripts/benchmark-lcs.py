@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Measures the time and peak memory taken to find the longest common subsequence of two sequences."""
+import operator
+import random
+import time
+import tracemalloc
+
+from facilitate.util import longest_common_subsequence
+
+SIZES = (10, 100, 500, 1000, 2000, 4000)
+NUM_SYMBOLS = 20
+SEED = 0
+
+
+def main() -> None:
+    rng = random.Random(SEED)
+
+    for size in SIZES:
+        lx = [rng.randrange(NUM_SYMBOLS) for _ in range(size)]
+        ly = [rng.randrange(NUM_SYMBOLS) for _ in range(size)]
+
+        start = time.perf_counter()
+        lcs = longest_common_subsequence(lx, ly, operator.eq)
+        duration = time.perf_counter() - start
+
+        # memory is measured separately, since tracing allocations slows down the search
+        tracemalloc.start()
+        longest_common_subsequence(lx, ly, operator.eq)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{size} x {size}: {duration * 1000:.1f} ms, "
+            f"peak memory {peak_bytes / 1024 / 1024:.1f} MiB "
+            f"(length: {len(lcs)})",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Measures the time taken to load each of the example programs.
+
+Each load is timed with the native ordering of node descriptions used by the loader and, for
+comparison, with the networkx-based topological sort that the loader previously used.
+"""
+from __future__ import annotations
+
+import json
+import timeit
+import typing as t
+from pathlib import Path
+from unittest import mock
+
+import networkx as nx
+from loguru import logger
+
+from facilitate import loader
+from facilitate.loader import load_program_from_block_descriptions
+
+DIR_SCRIPTS = Path(__file__).resolve().parent
+DIR_REPO = DIR_SCRIPTS.parent
+DIR_EXAMPLES = DIR_REPO / "examples"
+
+NUM_REPEATS = 5
+NUM_LOADS = 200
+
+
+def networkx_toposort(
+    id_to_node_description: dict[str, dict[str, t.Any]],
+) -> list[dict[str, t.Any]]:
+    """Orders node descriptions via networkx, as the loader did before it had a native ordering."""
+    graph = nx.DiGraph()
+    for id_, description in id_to_node_description.items():
+        graph.add_node(id_)
+        parent_id: str | None = description["parent"]
+        if parent_id:
+            graph.add_edge(parent_id, id_)
+    return [id_to_node_description[id_] for id_ in nx.topological_sort(graph)]
+
+
+def time_load(raw: str) -> float:
+    """Returns the best time taken to load a program from its JSON encoding, in milliseconds."""
+    # NOTE the loader mutates its input, so each load is given a fresh copy
+    timings = timeit.repeat(
+        lambda: load_program_from_block_descriptions(json.loads(raw)),
+        repeat=NUM_REPEATS,
+        number=NUM_LOADS,
+    )
+    return min(timings) / NUM_LOADS * 1000
+
+
+def main() -> None:
+    logger.remove()
+
+    for example_file in sorted(DIR_EXAMPLES.glob("*.json")):
+        with example_file.open() as fh:
+            block_descriptions = json.load(fh)
+        raw = json.dumps(block_descriptions)
+
+        native_ms = time_load(raw)
+        with mock.patch.object(loader, "_toposort", networkx_toposort):
+            networkx_ms = time_load(raw)
+
+        print(
+            f"{example_file.name} ({len(block_descriptions)} blocks): "
+            f"{native_ms:.3f} ms per load (networkx toposort: {networkx_ms:.3f} ms)",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Measures the effect of the GumTree recovery phase on runtime, edit script length, and distance."""
+from __future__ import annotations
+
+import itertools
+import time
+import typing as t
+from pathlib import Path
+
+from loguru import logger
+
+from facilitate.diff import delete_phase, update_insert_align_move_phase
+from facilitate.distance import compute_distance
+from facilitate.gumtree import compute_gumtree_mappings
+from facilitate.loader import load_from_file
+
+if t.TYPE_CHECKING:
+    from facilitate.edit import EditScript
+    from facilitate.model.program import Program
+
+DIR_SCRIPTS = Path(__file__).resolve().parent
+DIR_REPO = DIR_SCRIPTS.parent
+DIR_EXAMPLES = DIR_REPO / "examples"
+DIR_PROGRAMS = DIR_REPO / "tests" / "resources" / "programs"
+
+# a maximum size of zero disables recovery
+MAX_SIZES = (0, 25, 50, 100, 200)
+
+
+def compute_edit_script(tree_from: Program, tree_to: Program, max_size: int) -> EditScript:
+    """Computes an edit script between two programs with a given maximum size for recovery."""
+    # only the source program is modified (as the script is computed), so only it is copied
+    tree_from = tree_from.copy()
+    mappings = compute_gumtree_mappings(tree_from, tree_to, max_size=max_size)
+    script = update_insert_align_move_phase(tree_from, tree_to, mappings)
+    delete_phase(script, tree_from, mappings)
+    assert tree_from.equivalent_to(tree_to)
+    return script
+
+
+def main() -> None:
+    logger.remove()
+
+    files = sorted(DIR_EXAMPLES.glob("*.json")) + sorted(DIR_PROGRAMS.glob("**/*.json"))
+    programs = [load_from_file(file) for file in files]
+    pairs = list(itertools.permutations(programs, 2))
+    print(f"comparing {len(pairs)} pairs of programs")
+
+    for max_size in MAX_SIZES:
+        num_edits = 0
+        num_failures = 0
+        total_distance = 0.0
+
+        start = time.perf_counter()
+        for tree_from, tree_to in pairs:
+            try:
+                script = compute_edit_script(tree_from, tree_to, max_size)
+            except Exception:  # noqa: BLE001
+                num_failures += 1
+                continue
+            num_edits += len(script)
+            total_distance += compute_distance(tree_from=tree_from, edit_script=script, tree_to=tree_to)
+        duration = time.perf_counter() - start
+
+        print(
+            f"max size {max_size}: {duration:.2f} s, {num_edits} edits, "
+            f"total distance {total_distance:.1f}, {num_failures} failures",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Measures the time taken to traverse programs that contain deeply nested expressions."""
+from __future__ import annotations
+
+import timeit
+import typing as t
+
+from loguru import logger
+
+from facilitate.loader import load_program_from_block_descriptions
+
+if t.TYPE_CHECKING:
+    from facilitate.model.program import Program
+
+DEPTHS = (10, 100, 200, 400)
+NUM_REPEATS = 3
+NUM_RUNS = 10
+
+
+def build_nested_expression_program(depth: int) -> Program:
+    """Builds a program with a single move block whose input is a chain of nested additions."""
+    descriptions: dict[str, dict[str, t.Any]] = {
+        "move": {
+            "opcode": "motion_movesteps",
+            "next": None,
+            "parent": None,
+            "inputs": {"STEPS": [3, "add-0", [4, "10"]]},
+            "fields": {},
+            "shadow": False,
+            "topLevel": True,
+        },
+    }
+    for level in range(depth):
+        num1: list[t.Any] = [3, f"add-{level + 1}", [4, "1"]] if level + 1 < depth else [1, [4, "1"]]
+        descriptions[f"add-{level}"] = {
+            "opcode": "operator_add",
+            "next": None,
+            "parent": f"add-{level - 1}" if level > 0 else "move",
+            "inputs": {"NUM1": num1, "NUM2": [1, [4, "1"]]},
+            "fields": {},
+            "shadow": False,
+            "topLevel": False,
+        }
+    return load_program_from_block_descriptions(descriptions)
+
+
+def time_traversal(traverse: t.Callable[[], t.Any]) -> float:
+    """Returns the best time taken by a traversal, in milliseconds."""
+    timings = timeit.repeat(traverse, repeat=NUM_REPEATS, number=NUM_RUNS)
+    return min(timings) / NUM_RUNS * 1000
+
+
+def main() -> None:
+    logger.remove()
+
+    for depth in DEPTHS:
+        program = build_nested_expression_program(depth)
+        num_nodes = program.size()
+        preorder_ms = time_traversal(lambda program=program: list(program.nodes()))
+        postorder_ms = time_traversal(lambda program=program: list(program.postorder()))
+
+        program.number_nodes()
+        numbered_ms = time_traversal(lambda program=program: list(program.nodes()))
+        print(
+            f"depth {depth} ({num_nodes} nodes): preorder {preorder_ms:.3f} ms, postorder {postorder_ms:.3f} ms,"
+            f" numbered preorder {numbered_ms:.3f} ms",
+        )
+
+
+if __name__ == "__main__":
+    main()
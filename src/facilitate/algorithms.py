@@ -7,6 +7,40 @@ if t.TYPE_CHECKING:
     from facilitate.model.node import Node
 
 
+def preorder(root: Node) -> t.Iterator[Node]:
+    """Iterates over the nodes of the tree rooted at the given node in preorder.
+
+    The tree is traversed with an explicit stack of child iterators, rather than by recursion,
+    so that each node is yielded in constant time regardless of its depth.
+    """
+    yield root
+    stack = [root.children()]
+    while stack:
+        for node in stack[-1]:
+            yield node
+            stack.append(node.children())
+            break
+        else:
+            stack.pop()
+
+
+def postorder(root: Node) -> t.Iterator[Node]:
+    """Iterates over the nodes of the tree rooted at the given node in postorder.
+
+    The children of each node are listed before the first of them is visited, so nodes may be
+    detached from the tree once they have been yielded.
+    """
+    stack = [(root, iter(list(root.children())))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            stack.append((child, iter(list(child.children()))))
+            break
+        else:
+            stack.pop()
+            yield node
+
+
 def breadth_first_search(root: Node) -> t.Iterator[Node]:
     """Performs a breadth-first search of the tree rooted at the given node."""
     queue = deque([root])
@@ -14,3 +48,123 @@ def breadth_first_search(root: Node) -> t.Iterator[Node]:
         node = queue.popleft()
         yield node
         queue.extend(node.children())
+
+
+def _postorder_with_leftmost_leaves(root: Node) -> tuple[list[Node], list[int]]:
+    """Lists the nodes of a tree in postorder, along with the position of the leftmost leaf of each node.
+
+    Positions are 1-based: the first entry of each list is a placeholder.
+    """
+    nodes: list[Node] = [root]
+    leftmost_leaves: list[int] = [0]
+
+    stack: list[tuple[Node, bool]] = [(root, False)]
+    first_positions: list[int] = []
+    while stack:
+        node, is_exit = stack.pop()
+        if not is_exit:
+            first_positions.append(len(nodes))
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(list(node.children())))
+            continue
+        # the leftmost leaf of a node is the first node to be listed within its subtree
+        nodes.append(node)
+        leftmost_leaves.append(first_positions.pop())
+
+    return nodes, leftmost_leaves
+
+
+def _keyroots(leftmost_leaves: list[int]) -> list[int]:
+    """Finds the keyroots of a tree (i.e., the highest node with each leftmost leaf) in ascending order."""
+    highest_with_leftmost_leaf: dict[int, int] = {}
+    for position in range(1, len(leftmost_leaves)):
+        highest_with_leftmost_leaf[leftmost_leaves[position]] = position
+    return sorted(highest_with_leftmost_leaf.values())
+
+
+def tree_edit_mappings(  # noqa: PLR0915
+    root_x: Node,
+    root_y: Node,
+    rename_cost: t.Callable[[Node, Node], float],
+) -> list[tuple[Node, Node]]:
+    """Computes an optimal ordered mapping between two trees using the Zhang-Shasha algorithm.
+
+    The mapping minimizes the cost of transforming one tree into the other without moves,
+    where inserting or deleting a node costs one and renaming (i.e., updating) a node has
+    the given cost. Pairs with an infinite rename cost are never mapped.
+
+    Takes O(|X| |Y| min(depth, leaves)^2) time and O(|X| |Y|) space.
+    """
+    nodes_x, leftmost_x = _postorder_with_leftmost_leaves(root_x)
+    nodes_y, leftmost_y = _postorder_with_leftmost_leaves(root_y)
+    size_x = len(nodes_x) - 1
+    size_y = len(nodes_y) - 1
+
+    tree_distance = [[0.0] * (size_y + 1) for _ in range(size_x + 1)]
+
+    def compute_forest_distance(i: int, j: int) -> list[list[float]]:
+        """Computes the distances between all prefixes of the subtrees rooted at i and j."""
+        offset_x = leftmost_x[i] - 1
+        offset_y = leftmost_y[j] - 1
+        forest_distance = [[0.0] * (j - offset_y + 1) for _ in range(i - offset_x + 1)]
+        for di in range(1, i - offset_x + 1):
+            forest_distance[di][0] = forest_distance[di - 1][0] + 1
+        for dj in range(1, j - offset_y + 1):
+            forest_distance[0][dj] = forest_distance[0][dj - 1] + 1
+
+        for di in range(1, i - offset_x + 1):
+            x = di + offset_x
+            for dj in range(1, j - offset_y + 1):
+                y = dj + offset_y
+                deletion = forest_distance[di - 1][dj] + 1
+                insertion = forest_distance[di][dj - 1] + 1
+                if leftmost_x[x] == leftmost_x[i] and leftmost_y[y] == leftmost_y[j]:
+                    rename = forest_distance[di - 1][dj - 1] + rename_cost(nodes_x[x], nodes_y[y])
+                    forest_distance[di][dj] = min(deletion, insertion, rename)
+                    tree_distance[x][y] = forest_distance[di][dj]
+                else:
+                    subtrees = (
+                        forest_distance[leftmost_x[x] - 1 - offset_x][leftmost_y[y] - 1 - offset_y]
+                        + tree_distance[x][y]
+                    )
+                    forest_distance[di][dj] = min(deletion, insertion, subtrees)
+        return forest_distance
+
+    for i in _keyroots(leftmost_x):
+        for j in _keyroots(leftmost_y):
+            compute_forest_distance(i, j)
+
+    # recover the mapping by backtracking through the forest distances of each pair of subtrees
+    mappings: list[tuple[Node, Node]] = []
+    subtree_pairs = [(size_x, size_y)]
+    while subtree_pairs:
+        i, j = subtree_pairs.pop()
+        forest_distance = compute_forest_distance(i, j)
+        offset_x = leftmost_x[i] - 1
+        offset_y = leftmost_y[j] - 1
+        di = i - offset_x
+        dj = j - offset_y
+        while di > 0 and dj > 0:
+            x = di + offset_x
+            y = dj + offset_y
+            distance = forest_distance[di][dj]
+            is_tree_pair = leftmost_x[x] == leftmost_x[i] and leftmost_y[y] == leftmost_y[j]
+
+            # prefer to map nodes whenever doing so is optimal
+            if is_tree_pair and distance == forest_distance[di - 1][dj - 1] + rename_cost(nodes_x[x], nodes_y[y]):
+                mappings.append((nodes_x[x], nodes_y[y]))
+                di -= 1
+                dj -= 1
+            elif not is_tree_pair and distance == (
+                forest_distance[leftmost_x[x] - 1 - offset_x][leftmost_y[y] - 1 - offset_y]
+                + tree_distance[x][y]
+            ):
+                subtree_pairs.append((x, y))
+                di = leftmost_x[x] - 1 - offset_x
+                dj = leftmost_y[y] - 1 - offset_y
+            elif distance == forest_distance[di - 1][dj] + 1:
+                di -= 1
+            else:
+                dj -= 1
+
+    return mappings
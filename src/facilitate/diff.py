@@ -33,11 +33,14 @@ from facilitate.model.input import Input
 from facilitate.model.literal import Literal
 from facilitate.model.program import Program
 from facilitate.model.sequence import Sequence
-from facilitate.util import longest_common_subsequence
+from facilitate.tracing import trace_phase
+from facilitate.util import longest_increasing_subsequence
+from facilitate.verification import resolve_verification_level, verify_equivalent
 
 if t.TYPE_CHECKING:
     from facilitate.mappings import NodeMappings
     from facilitate.model.node import Node
+    from facilitate.verification import VerificationLevel
 
 
 def _find_insertion_position(
@@ -73,19 +76,12 @@ def _find_insertion_position(
     return 0
 
 
-def _align_children(
-    script: EditScript,
-    tree_from: Node,
+def find_mapped_children(
     parent_from: Sequence | Program,
     parent_to: Sequence | Program,
     mappings: NodeMappings,
-) -> None:
-    """Aligns the children of two nodes."""
-    logger.debug("aligning children of {} and {}", parent_from.id_, parent_to.id_)
-
-    def equals(x: Node, y: Node) -> bool:
-        return (x, y) in mappings
-
+) -> tuple[list[Node], list[Node]]:
+    """Finds the children of two mapped nodes whose partners are children of the other node."""
     # sequence of children of (parent_from) whose partners are children of (parent_to)
     mapped_node_from_children = [
         child for child in parent_from.children() if mappings.source_is_mapped(child)
@@ -102,31 +98,79 @@ def _align_children(
         child for child in mapped_node_to_children if mappings.destination_is_mapped_to(child).parent == parent_from  # type: ignore
     ]
 
-    logger.debug(
-        f"mapped node from children [{len(mapped_node_from_children)}]: "
-        f"{', '.join(block.id_ for block in mapped_node_from_children)}",
+    return mapped_node_from_children, mapped_node_to_children
+
+
+def find_aligned_children(
+    mapped_node_from_children: list[Node],
+    mapped_node_to_children: list[Node],
+    mappings: NodeMappings,
+) -> set[Node]:
+    """Finds a largest set of mapped children of (parent_to) that are in the same order as their partners.
+
+    Since mappings are one-to-one, the longest common subsequence of the mapped children of both
+    parents is given by the longest increasing subsequence of the positions of their partners.
+    """
+    node_from_position = {child: position for position, child in enumerate(mapped_node_from_children)}
+    partner_positions: list[int] = []
+    for child in mapped_node_to_children:
+        partner = mappings.destination_is_mapped_to(child)
+        assert partner is not None
+        partner_positions.append(node_from_position[partner])
+
+    return {
+        mapped_node_to_children[position]
+        for position in longest_increasing_subsequence(partner_positions)
+    }
+
+
+def _align_children(
+    script: EditScript,
+    tree_from: Node,
+    parent_from: Sequence | Program,
+    parent_to: Sequence | Program,
+    mappings: NodeMappings,
+) -> None:
+    """Aligns the children of two nodes."""
+    logger.debug("aligning children of {} and {}", parent_from.id_, parent_to.id_)
+
+    mapped_node_from_children, mapped_node_to_children = find_mapped_children(
+        parent_from,
+        parent_to,
+        mappings,
     )
-    logger.debug(
-        f"mapped node to children [{len(mapped_node_to_children)}]: "
-        f"{', '.join(block.id_ for block in mapped_node_to_children)}",
+
+    logger.opt(lazy=True).debug(
+        "mapped node from children [{}]: {}",
+        lambda: len(mapped_node_from_children),
+        lambda: ", ".join(block.id_ for block in mapped_node_from_children),
+    )
+    logger.opt(lazy=True).debug(
+        "mapped node to children [{}]: {}",
+        lambda: len(mapped_node_to_children),
+        lambda: ", ".join(block.id_ for block in mapped_node_to_children),
     )
 
-    lcs: list[tuple[Node, Node]] = longest_common_subsequence(
+    aligned_node_to_children = find_aligned_children(
         mapped_node_from_children,
         mapped_node_to_children,
-        equals,
+        mappings,
+    )
+    logger.opt(lazy=True).debug(
+        "aligned (node to) [{}]: {}",
+        lambda: len(aligned_node_to_children),
+        lambda: ", ".join(child.id_ for child in aligned_node_to_children),
     )
-    lcs_node_to: list[Node] = [y for (_, y) in lcs]
-    logger.debug(f"lcs (node to) [{len(lcs_node_to)}]: {', '.join(child.id_ for child in lcs_node_to)}")
 
+    mapped_node_from_children_set = set(mapped_node_from_children)
     for b in mapped_node_to_children:
-        if b in lcs_node_to:
+        if b in aligned_node_to_children:
             continue
 
         a = mappings.destination_is_mapped_to(b)
         assert a is not None
 
-        if a not in mapped_node_from_children:
+        if a not in mapped_node_from_children_set:
             continue
 
         position = _find_insertion_position(
@@ -341,7 +385,7 @@ def _move_node(
     assert move_node_partner_parent is not None
     move_to_parent = mappings.destination_is_mapped_to(move_node_partner_parent)
     assert move_to_parent is not None
-    logger.debug(f"moving to parent: {move_to_parent.id_} {move_to_parent.__class__.__name__}")
+    logger.debug("moving to parent: {} {}", move_to_parent.id_, move_to_parent.__class__.__name__)
 
     if isinstance(move_node, Input):
         return _move_input(
@@ -491,7 +535,7 @@ def update_insert_align_move_phase(
     script = EditScript()
 
     for node_to in breadth_first_search(tree_to):
-        logger.debug(f"processing node: {node_to.id_} {node_to.__class__.__name__}")
+        logger.debug("processing node: {} {}", node_to.id_, node_to.__class__.__name__)
 
         _maybe_node_from = mappings.destination_is_mapped_to(node_to)
 
@@ -548,21 +592,38 @@ def update_insert_align_move_phase(
 def compute_edit_script(
     tree_from: Node,
     tree_to: Node,
+    *,
+    verification: VerificationLevel | None = None,
 ) -> EditScript:
-    """Computes an edit script to transform one tree into another."""
+    """Computes an edit script to transform one tree into another.
+
+    Unless the verification level is OFF, the edit script is checked to transform the first tree
+    into the second (see facilitate.verification).
+
+    The edit script is computed by transforming a copy of the first tree. The second tree is read
+    without being copied; if its caches have been precomputed (see Node.precompute_caches), it is
+    not written to at all and may be shared by concurrent calls.
+    """
+    verification = resolve_verification_level(verification)
     tree_from = tree_from.copy()
-    tree_to = tree_to.copy()
 
-    mappings = compute_gumtree_mappings(tree_from, tree_to)
+    mappings = compute_gumtree_mappings(tree_from, tree_to, verification=verification)
     logger.debug("mappings: {}", mappings)
 
-    script = update_insert_align_move_phase(tree_from, tree_to, mappings)
-    delete_phase(
-        script=script,
-        tree_from=tree_from,
-        mappings=mappings,
-    )
+    with trace_phase("diff.update-insert-align-move") as event:
+        script = update_insert_align_move_phase(tree_from, tree_to, mappings)
+        event["edits"] = len(script)
+
+    with trace_phase("diff.delete") as event:
+        delete_phase(
+            script=script,
+            tree_from=tree_from,
+            mappings=mappings,
+        )
+        event["edits"] = len(script)
 
-    assert tree_from.equivalent_to(tree_to)
+    with trace_phase("diff.verify") as event:
+        verify_equivalent(tree_from, tree_to, verification)
+        event["verification"] = verification.value
 
     return script
@@ -1,7 +1,9 @@
 """Computes weighted distances from edit scripts."""
 from __future__ import annotations
 
-from facilitate.diff import compute_edit_script
+import typing as t
+
+from facilitate.diff import compute_edit_script, find_aligned_children, find_mapped_children
 from facilitate.edit import (
     AddBlockToInput,
     AddBlockToSequence,
@@ -22,6 +24,7 @@ from facilitate.edit import (
     MoveSequenceToProgram,
     Update,
 )
+from facilitate.gumtree import compute_gumtree_mappings
 from facilitate.model.block import Block
 from facilitate.model.field import Field
 from facilitate.model.input import Input
@@ -29,6 +32,10 @@ from facilitate.model.literal import Literal
 from facilitate.model.program import Program
 from facilitate.model.sequence import Sequence
 
+if t.TYPE_CHECKING:
+    from facilitate.mappings import NodeMappings
+    from facilitate.model.node import Node
+
 DELETE_BLOCK_COST = 0.5
 DELETE_FIELD_COST = 0.0
 DELETE_INPUT_COST = 0.0
@@ -53,6 +60,69 @@ UPDATE_LITERAL_COST = 0.5
 UPDATE_BLOCK_COST = 1.0
 
 
+def _update_cost(node: Node) -> float:
+    """Computes the cost of updating a given node."""
+    match node:
+        case Block():
+            return UPDATE_BLOCK_COST
+        case Literal():
+            return UPDATE_LITERAL_COST
+    return 0.0
+
+
+def _deletion_cost(node: Node) -> float:
+    """Computes the cost of deleting a given node."""
+    match node:
+        case Block():
+            return DELETE_BLOCK_COST
+        case Sequence():
+            return DELETE_SEQUENCE_COST
+        case Literal():
+            return DELETE_LITERAL_COST
+        case Field():
+            return DELETE_FIELD_COST
+        case Input():
+            return DELETE_INPUT_COST
+    return 0.0
+
+
+def _insertion_cost(node: Node) -> float:
+    """Computes the cost of inserting a given node."""
+    match node:
+        case Sequence():
+            return INSERT_SEQUENCE_COST
+        case Block():
+            return INSERT_BLOCK_COST
+        case Field():
+            return INSERT_FIELD_COST
+        case Input():
+            return INSERT_INPUT_COST
+    return 0.0
+
+
+def _move_cost(node: Node, move_to_parent: Node) -> float:
+    """Computes the cost of moving a given node to a new parent."""
+    match node, move_to_parent:
+        case Block() | Sequence() | Literal(), Input():
+            return MOVE_NODE_TO_INPUT_COST
+        case Block(), Sequence():
+            return MOVE_BLOCK_TO_SEQUENCE_COST
+        case Sequence(), Program():
+            return MOVE_SEQUENCE_TO_PROGRAM_COST
+        case Field(), _:
+            return MOVE_FIELD_TO_BLOCK_COST
+        case Input(), _:
+            return MOVE_INPUT_TO_BLOCK_COST
+    return MOVE_OTHER_COST
+
+
+def _alignment_cost(parent: Sequence | Program) -> float:
+    """Computes the cost of moving a child of a given node to a new position."""
+    if isinstance(parent, Sequence):
+        return MOVE_BLOCK_IN_SEQUENCE_COST
+    return MOVE_SEQUENCE_IN_PROGRAM_COST
+
+
 def _compute_update_costs(
     tree_from: Program,
     edit_script: EditScript,
@@ -64,12 +134,7 @@ def _compute_update_costs(
     for update in updates:
         node = tree_from.find(update.node_id)
         assert node is not None
-
-        match node:
-            case Block():
-                cost += UPDATE_BLOCK_COST
-            case Literal():
-                cost += UPDATE_LITERAL_COST
+        cost += _update_cost(node)
 
     return cost
 
@@ -110,18 +175,7 @@ def _compute_deletion_costs(
     for deletion in deletions:
         node = tree_from.find(deletion.node_id)
         assert node is not None
-
-        match node:
-            case Block():
-                cost += DELETE_BLOCK_COST
-            case Sequence():
-                cost += DELETE_SEQUENCE_COST
-            case Literal():
-                cost += DELETE_LITERAL_COST
-            case Field():
-                cost += DELETE_FIELD_COST
-            case Input():
-                cost += DELETE_INPUT_COST
+        cost += _deletion_cost(node)
 
     return cost
 
@@ -186,3 +240,70 @@ def compute_edit_script_and_distance(
         edit_script=edit_script,
     )
     return edit_script, distance
+
+
+def compute_distance_from_mappings(
+    tree_from: Program,
+    tree_to: Program,
+    mappings: NodeMappings,
+) -> float:
+    """Computes the weighted distance of the edit script implied by a set of mappings.
+
+    This gives the same distance as compute_distance, but accumulates the cost of each edit
+    without building an edit script or applying it to a copy of the tree. The same edits
+    are implied as in update_insert_align_move_phase and delete_phase:
+
+    - each unmapped node in tree_to is inserted, and each unmapped node in tree_from is deleted
+    - each mapped node whose partner differs on the surface is updated
+    - each mapped node whose parent is not mapped to the parent of its partner is moved
+    - each child of a mapped sequence or program that is not part of the longest common
+      subsequence of mapped children is moved within its parent
+
+    Neither tree is modified.
+    """
+    cost = 0.0
+
+    for node_to in tree_to.nodes():
+        node_from = mappings.destination_is_mapped_to(node_to)
+        if node_from is None:
+            cost += _insertion_cost(node_to)
+            continue
+
+        if not node_from.surface_equivalent_to(node_to):
+            cost += _update_cost(node_from)
+
+        parent_from = node_from.parent
+        parent_to = node_to.parent
+        if parent_from is not None and parent_to is not None:  # noqa: SIM102
+            if (parent_from, parent_to) not in mappings:
+                cost += _move_cost(node_from, parent_to)
+
+        if isinstance(node_from, Sequence | Program):
+            assert isinstance(node_to, Sequence | Program)
+            mapped_node_from_children, mapped_node_to_children = find_mapped_children(
+                node_from,
+                node_to,
+                mappings,
+            )
+            aligned_node_to_children = find_aligned_children(
+                mapped_node_from_children,
+                mapped_node_to_children,
+                mappings,
+            )
+            num_misaligned_children = len(mapped_node_to_children) - len(aligned_node_to_children)
+            cost += num_misaligned_children * _alignment_cost(node_from)
+
+    for node_from in tree_from.nodes():
+        if not mappings.source_is_mapped(node_from):
+            cost += _deletion_cost(node_from)
+
+    return cost
+
+
+def compute_distance_only(
+    tree_from: Program,
+    tree_to: Program,
+) -> float:
+    """Computes the weighted distance between two trees without computing an edit script."""
+    mappings = compute_gumtree_mappings(tree_from, tree_to)
+    return compute_distance_from_mappings(tree_from, tree_to, mappings)
@@ -16,6 +16,7 @@ from facilitate.model.input import Input
 from facilitate.model.literal import Literal
 from facilitate.model.program import Program
 from facilitate.model.sequence import Sequence
+from facilitate.model.tag import Tag
 
 if t.TYPE_CHECKING:
     from PIL.Image import Image
@@ -71,10 +72,8 @@ class AddSequenceToProgram(Addition):
         """Inserts and returns the given input."""
         assert isinstance(root, Program)
         added = Sequence.create()
-        added.tags.append("ADDED")
-        added.parent = root
-        root.top_level_nodes.insert(self.position, added)
-        return added
+        added.add_tag(Tag.ADDED)
+        return root.insert_child(added, self.position)
 
     @overrides
     def to_dict(self) -> dict[str, t.Any]:
@@ -103,7 +102,7 @@ class AddInputToBlock(Addition):
         parent = root.find(self.block_id)
         assert isinstance(parent, Block)
         added = parent.add_input(self.name)
-        added.tags.append("ADDED")
+        added.add_tag(Tag.ADDED)
         return added
 
     @overrides
@@ -139,7 +138,7 @@ class AddLiteralToInput(Addition):
         assert isinstance(parent, Input)
         added = Literal.create(value=self.value)
         parent.add_child(added)
-        added.tags.append("ADDED")
+        added.add_tag(Tag.ADDED)
         return added
 
     @overrides
@@ -181,7 +180,7 @@ class AddBlockToSequence(Addition):
             is_shadow=self.is_shadow,
             position=self.position,
         )
-        added.tags.append("ADDED")
+        added.add_tag(Tag.ADDED)
         return added
 
     @overrides
@@ -267,7 +266,7 @@ class AddBlockToInput(Addition):
             is_shadow=self.is_shadow,
         )
         parent.add_child(block)
-        block.tags.append("ADDED")
+        block.add_tag(Tag.ADDED)
         return block
 
     @overrides
@@ -306,7 +305,7 @@ class AddFieldToBlock(Addition):
         parent = root.find(self.block_id)
         assert isinstance(parent, Block)
         added = parent.add_field(self.name, self.value)
-        added.tags.append("ADDED")
+        added.add_tag(Tag.ADDED)
         return added
 
     @overrides
@@ -360,14 +359,13 @@ class MoveSequenceToProgram(Move):
             if position > current_position:
                 position -= 1
 
-            root.top_level_nodes.remove(sequence)
+            root.remove_child(sequence)
 
         # or are we moving a sequence from elsewhere in the program?
         else:
             sequence.parent.remove_child(sequence)
 
-        root.top_level_nodes.insert(position, sequence)
-        return sequence
+        return root.insert_child(sequence, position)
 
     @overrides
     def to_dict(self) -> dict[str, t.Any]:
@@ -406,7 +404,7 @@ class MoveFieldToBlock(Move):
         assert field is not None
         assert isinstance(field, Field)
 
-        field.add_tag_to_subtree("MOVED")
+        field.add_tag_to_subtree(Tag.MOVED)
 
         move_from_block.remove_child(field)
         return move_to_block.add_child(field)
@@ -451,7 +449,7 @@ class MoveInputToBlock(Move):
         assert input_ is not None
         assert isinstance(input_, Input)
 
-        input_.add_tag_to_subtree("MOVED")
+        input_.add_tag_to_subtree(Tag.MOVED)
 
         logger.debug(
             "moving input {} from {} to {}",
@@ -507,9 +505,8 @@ class MoveBlockToSequence(Move):
             raise NotImplementedError
 
         move_from_parent.remove_child(move_block)
-        move_to_sequence.blocks.insert(self.position, move_block)
-        move_block.parent = move_to_sequence
-        move_block.add_tag_to_subtree("MOVED")
+        move_to_sequence.insert_child(move_block, self.position)
+        move_block.add_tag_to_subtree(Tag.MOVED)
         return move_block
 
     @overrides
@@ -595,14 +592,13 @@ class MoveSequenceInProgram(Move):
         assert sequence.parent == root
 
         current_position = root.position_of_child(sequence)
-        root.top_level_nodes.remove(sequence)
+        root.remove_child(sequence)
 
         new_position = self.position
         if new_position > current_position:
             new_position -= 1
 
-        root.top_level_nodes.insert(new_position, sequence)
-        return sequence
+        return root.insert_child(sequence, new_position)
 
     @overrides
     def to_dict(self) -> dict[str, t.Any]:
@@ -635,19 +631,19 @@ class MoveBlockInSequence(Move):
         """Moves the block to the given position in the sequence."""
         sequence = root.find(self.sequence_id)
         assert isinstance(sequence, Sequence)
-        block = sequence.find(self.block_id)
+        block = root.find(self.block_id)
         assert isinstance(block, Block)
         assert block.parent == sequence
 
         current_position = sequence.blocks.index(block)
-        sequence.blocks.remove(block)
+        sequence.remove_child(block)
 
         new_position = self.position
         if new_position > current_position:
             new_position -= 1
 
-        sequence.blocks.insert(new_position, block)
-        block.add_tag_to_subtree("MOVED")
+        sequence.insert_child(block, new_position)
+        block.add_tag_to_subtree(Tag.MOVED)
         return block
 
     @overrides
@@ -737,11 +733,17 @@ class Update(Edit):
             node.value = self.value
         elif isinstance(node, Input):
             node.name = self.value
+            # reinsert the input so that the inputs of its block remain in alphabetical order
+            block = node.parent
+            if isinstance(block, Block):
+                block.remove_child(node)
+                block.add_child(node)
         else:
             error = f"cannot update node of type {type(node)}"
             raise TypeError(error)
 
-        node.tags.append("UPDATED")
+        node.invalidate_digest()
+        node.add_tag(Tag.UPDATED)
         return node
 
     @overrides
@@ -795,7 +797,7 @@ class Delete(Edit):
         if not no_delete:
             parent.remove_child(node)
 
-        node.tags.append("DELETED")
+        node.add_tag(Tag.DELETED)
 
         return None
 
@@ -873,7 +875,7 @@ class EditScript(t.Iterable[Edit]):
 
         # draw state of tree after each edit
         for edit in self._edits:
-            logger.debug(f"GIF: applying edit: {edit}")
+            logger.debug("GIF: applying edit: {}", edit)
             edit.apply(tree, no_delete=True)
             frames.append(tree.to_dot_pil_image())
 
@@ -11,6 +11,7 @@ from overrides import overrides
 from facilitate.diff import compute_edit_script
 from facilitate.loader import load_from_file
 from facilitate.util import exception_to_crash_description
+from facilitate.verification import VerificationLevel
 
 
 @dataclass(frozen=True)
@@ -74,7 +75,7 @@ class BaseDiffFuzzer(abc.ABC):
         try:
             from_program = load_from_file(from_program_file)
             to_program = load_from_file(to_program_file)
-            compute_edit_script(from_program, to_program)
+            compute_edit_script(from_program, to_program, verification=VerificationLevel.FULL)
         except Exception as err:  # noqa: BLE001
             return DiffCrash.build(
                 from_program=from_program_file,
@@ -1,29 +1,39 @@
 from __future__ import annotations
 
-import functools
+import heapq
+import math
 import typing as t
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
-from itertools import product
 
 from loguru import logger
 
+from facilitate.algorithms import tree_edit_mappings
 from facilitate.mappings import NodeMappings
 from facilitate.model.block import Block
 from facilitate.model.field import Field
 from facilitate.model.input import Input
+from facilitate.model.literal import Literal
 from facilitate.model.program import Program
 from facilitate.model.sequence import Sequence
+from facilitate.tracing import trace_phase
+from facilitate.verification import resolve_verification_level, verify_mappings
 
 if t.TYPE_CHECKING:
     from facilitate.model.node import Node
+    from facilitate.verification import VerificationLevel
 
 
 @dataclass
 class HeightIndexedPriorityList:
-    _height_to_nodes: dict[int, list[Node]] = field(
-        default_factory=functools.partial(defaultdict, list),
-    )
+    """Groups nodes by their height and provides access to the nodes with maximal height.
+
+    The distinct heights of the nodes in the list are kept in a max-heap (i.e., a min-heap of
+    negated heights), so that the maximum height can be found in O(1) time, and nodes can be
+    pushed and popped in O(log h) time, where h is the number of distinct heights in the list.
+    """
+    _height_to_nodes: dict[int, list[Node]] = field(default_factory=dict)
+    _negated_heights: list[int] = field(default_factory=list)
 
     @property
     def max_height(self) -> int:
@@ -32,20 +42,25 @@ class HeightIndexedPriorityList:
 
     def peek_max(self) -> int:
         """Returns the maximum height of a node in the list."""
-        if not self._height_to_nodes:
+        if not self._negated_heights:
             return 0
-        return max(height for height in self._height_to_nodes)
+        return -self._negated_heights[0]
 
     def push(self, node: Node) -> None:
         """Adds a node to the list."""
-        self._height_to_nodes[node.height].append(node)
+        height = node.height
+        nodes = self._height_to_nodes.get(height)
+        if nodes is None:
+            nodes = self._height_to_nodes[height] = []
+            heapq.heappush(self._negated_heights, -height)
+        nodes.append(node)
 
     def pop(self) -> list[Node]:
         """Removes and returns the set of nodes with maximal height."""
-        max_height = self.peek_max()
-        nodes = self._height_to_nodes[max_height]
-        del self._height_to_nodes[max_height]
-        return nodes
+        if not self._negated_heights:
+            return []
+        max_height = -heapq.heappop(self._negated_heights)
+        return self._height_to_nodes.pop(max_height)
 
     def add_children(self, node: Node) -> None:
         """Inserts all children of given node into the list."""
@@ -53,6 +68,13 @@ class HeightIndexedPriorityList:
             self.push(child)
 
 
+def _ensure_numbered(*roots: Node) -> None:
+    """Numbers each tree (if necessary) so that dice and contains need not traverse subtrees."""
+    for root in roots:
+        if not root.is_numbered():
+            root.number_nodes()
+
+
 def dice(
     root_x: Node,
     root_y: Node,
@@ -66,18 +88,38 @@ def dice(
     ) -> float:
         return 2 * common_elements / (elements_in_x + elements_in_y)
 
-    descendants_x = set(root_x.descendants())
-    descendants_y = set(root_y.descendants())
-
     mapped_descendants = 0
 
-    for node_x in descendants_x:
-        node_y = mappings.source_is_mapped_to(node_x)
-        if node_y and node_y in descendants_y:
-            mapped_descendants += 1
-
-    num_descendants_x = len(descendants_x)
-    num_descendants_y = len(descendants_y)
+    if root_x.is_numbered() and root_y.is_numbered():
+        # count the mapped descendants from the side with fewer descendants, using the
+        # preorder numbering of each tree to check whether its partner is a descendant
+        numbered_descendants_x = root_x.numbered_descendants()
+        numbered_descendants_y = root_y.numbered_descendants()
+        num_descendants_x = len(numbered_descendants_x)
+        num_descendants_y = len(numbered_descendants_y)
+
+        if num_descendants_x <= num_descendants_y:
+            for descendant_x in numbered_descendants_x:
+                partner_y = mappings.source_is_mapped_to(descendant_x)
+                if partner_y and root_y.contains(partner_y):
+                    mapped_descendants += 1
+        else:
+            for descendant_y in numbered_descendants_y:
+                partner_x = mappings.destination_is_mapped_to(descendant_y)
+                if partner_x and root_x.contains(partner_x):
+                    mapped_descendants += 1
+
+    else:
+        descendants_x = set(root_x.descendants())
+        descendants_y = set(root_y.descendants())
+
+        for node_x in descendants_x:
+            node_y = mappings.source_is_mapped_to(node_x)
+            if node_y and node_y in descendants_y:
+                mapped_descendants += 1
+
+        num_descendants_x = len(descendants_x)
+        num_descendants_y = len(descendants_y)
     num_descendants_total = num_descendants_x + num_descendants_y
 
     if num_descendants_total == 0:
@@ -100,106 +142,230 @@ def dice(
     score = min(score, 1.0)
 
     logger.trace(
-        f"dice(common={mapped_descendants}, x={num_descendants_x}, y={num_descendants_y})"
-        f" = {score:.2f} @ ({root_x.id_}, {root_y.id_})",
+        "dice(common={}, x={}, y={}) = {:.2f} @ ({}, {})",
+        mapped_descendants,
+        num_descendants_x,
+        num_descendants_y,
+        score,
+        root_x.id_,
+        root_y.id_,
     )
     return score
 
 
-def compute_topdown_mappings(
+def compute_id_mappings(root_x: Node, root_y: Node) -> NodeMappings:
+    """Maps the nodes of two trees that share an ID, in linear time.
+
+    Blocks and sequences keep their IDs across successive snapshots of the same program, so
+    blocks, sequences, and programs of the same type are mapped if their IDs are equal.
+    The fields and inputs of a mapped block (whose IDs are generated when the program is loaded)
+    are then mapped to those of its partner by name, as are literals within mapped inputs.
+    """
+    mappings = NodeMappings()
+
+    id_to_node_y: dict[str, Node] = {}
+    for node_y in root_y.nodes():
+        if isinstance(node_y, Block | Sequence | Program):
+            id_to_node_y.setdefault(node_y.id_, node_y)
+
+    mapped_blocks: list[tuple[Block, Block]] = []
+    for node_x in root_x.nodes():
+        if not isinstance(node_x, Block | Sequence | Program):
+            continue
+        partner_y = id_to_node_y.get(node_x.id_)
+        if partner_y is None or type(node_x) is not type(partner_y):
+            continue
+        if mappings.source_is_mapped(node_x) or mappings.destination_is_mapped(partner_y):
+            continue
+        mappings.add(node_x, partner_y)
+        if isinstance(node_x, Block):
+            assert isinstance(partner_y, Block)
+            mapped_blocks.append((node_x, partner_y))
+
+    for block_x, block_y in mapped_blocks:
+        for field_x in block_x.fields:
+            field_y = block_y.find_field(field_x.name)
+            if field_y is not None:
+                mappings.add(field_x, field_y)
+
+        for input_x in block_x.inputs:
+            input_y = block_y.find_input(input_x.name)
+            if input_y is None:
+                continue
+            mappings.add(input_x, input_y)
+            if isinstance(input_x.expression, Literal) and isinstance(input_y.expression, Literal):
+                mappings.add(input_x.expression, input_y.expression)
+
+    logger.debug("mapped {} nodes by their IDs", len(mappings))
+    return mappings
+
+
+def _find_unmapped_subtrees(root: Node, is_mapped: t.Callable[[Node], bool]) -> list[Node]:
+    """Returns the unmapped nodes of a tree whose parents are mapped, in preorder.
+
+    If the root of the tree is unmapped, it is the first such node.
+    """
+    return [
+        node for node in root.nodes()
+        if not is_mapped(node) and (node is root or (node.parent is not None and is_mapped(node.parent)))
+    ]
+
+
+def _add_unmapped_with_descendants(mappings: NodeMappings, node_x: Node, node_y: Node) -> None:
+    """Maps two isomorphic subtrees, skipping any pair in which either node is already mapped."""
+    for descendant_x, descendant_y in zip(node_x.nodes(), node_y.nodes(), strict=True):
+        if mappings.source_is_mapped(descendant_x) or mappings.destination_is_mapped(descendant_y):
+            continue
+        mappings.add(descendant_x, descendant_y)
+
+
+def compute_topdown_mappings(  # noqa: PLR0915
     root_x: Node,
     root_y: Node,
     *,
     min_height: int = 1,
+    mappings: NodeMappings | None = None,
 ) -> NodeMappings:
-    mappings = NodeMappings()
+    """Finds the mappings between the greatest isomorphic subtrees of two trees.
+
+    If mappings are given (e.g., by compute_id_mappings), they are extended in place, and only
+    the subtrees of unmapped nodes are searched.
+    """
+    _ensure_numbered(root_x, root_y)
+    if mappings is None:
+        mappings = NodeMappings()
     candidates: list[tuple[Node, Node]] = []
 
+    # the search starts from the roots of the unmapped regions of each tree
+    # (i.e., from the root of each tree if no mappings are given)
     hlist_x = HeightIndexedPriorityList()
-    hlist_x.push(root_x)
+    for node_x in _find_unmapped_subtrees(root_x, mappings.source_is_mapped):
+        hlist_x.push(node_x)
 
     hlist_y = HeightIndexedPriorityList()
-    hlist_y.push(root_y)
+    for node_y in _find_unmapped_subtrees(root_y, mappings.destination_is_mapped):
+        hlist_y.push(node_y)
+
+    # group the unmapped nodes of each tree into buckets of equivalent subtrees
+    bucket_size_x = Counter(
+        (node.height, node.digest) for node in root_x.nodes()
+        if not mappings.source_is_mapped(node)
+    )
+    bucket_size_y = Counter(
+        (node.height, node.digest) for node in root_y.nodes()
+        if not mappings.destination_is_mapped(node)
+    )
 
-    nodes_x = list(root_x.nodes())
-    nodes_y = list(root_y.nodes())
+    def add_unmapped_children(
+        hlist: HeightIndexedPriorityList,
+        node: Node,
+        is_mapped: t.Callable[[Node], bool],
+    ) -> None:
+        for child in node.children():
+            if not is_mapped(child):
+                hlist.push(child)
 
     while True:
         min_max_height = min(hlist_x.max_height, hlist_y.max_height)
         if min_max_height < min_height:
             break
-        logger.debug(f"max height x vs. y: {hlist_x.max_height} vs. {hlist_y.max_height}")
+        logger.debug("max height x vs. y: {} vs. {}", hlist_x.max_height, hlist_y.max_height)
 
+        # nodes may have been mapped (as descendants of an isomorphic subtree) since they were pushed
         if hlist_x.max_height > hlist_y.max_height:
             for node in hlist_x.pop():
-                hlist_x.add_children(node)
+                if not mappings.source_is_mapped(node):
+                    add_unmapped_children(hlist_x, node, mappings.source_is_mapped)
         elif hlist_x.max_height < hlist_y.max_height:
             for node in hlist_y.pop():
-                hlist_y.add_children(node)
+                if not mappings.destination_is_mapped(node):
+                    add_unmapped_children(hlist_y, node, mappings.destination_is_mapped)
         else:
-            max_height_nodes_x = hlist_x.pop()
-            max_height_nodes_y = hlist_y.pop()
-
-            logger.debug(
-                f"max height nodes x: {', '.join(node.id_ for node in max_height_nodes_x)}",
+            height = hlist_x.max_height
+            max_height_nodes_x = [node for node in hlist_x.pop() if not mappings.source_is_mapped(node)]
+            max_height_nodes_y = [node for node in hlist_y.pop() if not mappings.destination_is_mapped(node)]
+
+            # node IDs are only joined if debug messages are logged
+            logger.opt(lazy=True).debug(
+                "max height nodes x: {}",
+                lambda nodes=max_height_nodes_x: ", ".join(node.id_ for node in nodes),
             )
-            logger.debug(
-                f"max height nodes y: {', '.join(node.id_ for node in max_height_nodes_y)}",
+            logger.opt(lazy=True).debug(
+                "max height nodes y: {}",
+                lambda nodes=max_height_nodes_y: ", ".join(node.id_ for node in nodes),
             )
 
-            added_trees_x: list[Node] = []
-            added_trees_y: list[Node] = []
+            digest_to_nodes_y: dict[bytes, list[Node]] = defaultdict(list)
+            for node_y in max_height_nodes_y:
+                digest_to_nodes_y[node_y.digest].append(node_y)
 
-            for node_x, node_y in product(max_height_nodes_x, max_height_nodes_y):
-                if node_x.equivalent_to(node_y):
-                    logger.debug(f"equivalent: {node_x.id_} vs. {node_y.id_}")
+            added_trees_x: set[Node] = set()
+            added_trees_y: set[Node] = set()
 
-                    # FIXME these queries can be cached
-                    # is there more than one possible match for either node?
-                    match_x = any(node.equivalent_to(node_y) and node != node_x for node in nodes_x)
-                    match_y = any(node.equivalent_to(node_x) and node != node_y for node in nodes_y)
+            for node_x in max_height_nodes_x:
+                for node_y in digest_to_nodes_y.get(node_x.digest, []):
+                    logger.debug("equivalent: {} vs. {}", node_x.id_, node_y.id_)
 
-                    if match_x or match_y:
-                        logger.debug(f"candidate match: {node_x.id_} vs. {node_y.id_}")
+                    # is there more than one possible match for either node?
+                    bucket = (height, node_x.digest)
+                    if bucket_size_x[bucket] > 1 or bucket_size_y[bucket] > 1:
+                        logger.debug("candidate match: {} vs. {}", node_x.id_, node_y.id_)
                         candidates.append((node_x, node_y))
                     else:
-                        logger.debug(f"isolated match: {node_x.id_} vs. {node_y.id_}")
-                        mappings.add_with_descendants(node_x, node_y)
+                        logger.debug("isolated match: {} vs. {}", node_x.id_, node_y.id_)
+                        _add_unmapped_with_descendants(mappings, node_x, node_y)
 
-                    added_trees_x.append(node_x)
-                    added_trees_y.append(node_y)
+                    added_trees_x.add(node_x)
+                    added_trees_y.add(node_y)
 
             for node in max_height_nodes_x:
                 if node not in added_trees_x:
-                    hlist_x.add_children(node)
+                    add_unmapped_children(hlist_x, node, mappings.source_is_mapped)
 
             for node in max_height_nodes_y:
                 if node not in added_trees_y:
-                    hlist_y.add_children(node)
+                    add_unmapped_children(hlist_y, node, mappings.destination_is_mapped)
 
-    def sort_key(map_entry: tuple[Node, Node]) -> float:
-        node_x, node_y = map_entry
+    # candidates are resolved in order of their dice score (and, for equal scores, in the order
+    # in which they were found). once a node has been matched, any remaining candidates that
+    # include it are discarded when they reach the front of the queue.
+    candidate_queue: list[tuple[float, int, Node, Node]] = []
+    for position, (node_x, node_y) in enumerate(candidates):
         score = dice(node_x, node_y, mappings)
-        logger.trace(f"score [{node_x.id_} -> {node_y.id_}]: {score}")
-        return score
+        logger.trace("score [{} -> {}]: {}", node_x.id_, node_y.id_, score)
+        candidate_queue.append((score, position, node_x, node_y))
+    heapq.heapify(candidate_queue)
+
+    matched_x: set[Node] = set()
+    matched_y: set[Node] = set()
+
+    while candidate_queue:
+        _, _, node_x, node_y = heapq.heappop(candidate_queue)
+        if node_x in matched_x or node_y in matched_y:
+            continue
+        if mappings.source_is_mapped(node_x) or mappings.destination_is_mapped(node_y):
+            continue
+        logger.debug("matched candidate: {} -> {}", node_x.id_, node_y.id_)
+        _add_unmapped_with_descendants(mappings, node_x, node_y)
+        matched_x.add(node_x)
+        matched_y.add(node_y)
 
-    candidates.sort(key=sort_key)
+    return mappings
 
-    logger.debug(
-        "sorted candidates:\n{}",
-        "\n".join(f"* {node_x.id_} -> {node_y.id_}" for (node_x, node_y) in candidates),
-    )
 
-    while candidates:
-        node_x, node_y = candidates.pop(0)
-        mappings.add_with_descendants(node_x, node_y)
-        candidates = [
-            (from_x, to_y)
-            for from_x, to_y in candidates
-            if from_x != node_x and to_y != node_y
-        ]
+def _recovery_rename_cost(node_x: Node, node_y: Node) -> float:
+    """Returns the cost of mapping two nodes during recovery.
 
-    return mappings
+    Nodes may only be mapped if they are of the same type and one can be updated to the other.
+    """
+    if type(node_x) is not type(node_y):
+        return math.inf
+    if node_x.surface_equivalent_to(node_y):
+        return 0.0
+    # the name of a field cannot be updated
+    if isinstance(node_x, Field) and isinstance(node_y, Field) and node_x.name != node_y.name:
+        return math.inf
+    return 1.0
 
 
 def compute_bottom_up_mappings(
@@ -208,7 +374,48 @@ def compute_bottom_up_mappings(
     mappings: NodeMappings,
     *,
     min_dice: float = 0.5,
+    max_size: int = 100,
 ) -> NodeMappings:
+    """Finds container mappings between two trees, given the mappings of the top-down phase.
+
+    Whenever two containers are mapped, unmatched descendants of both are recovered via an optimal
+    tree edit distance mapping, provided that neither subtree has max_size or more nodes.
+    Setting max_size to zero disables recovery.
+    """
+    _ensure_numbered(root_x, root_y)
+
+    # the unmatched nodes of T2 are indexed by their type (i.e., their label) and, within each
+    # type, by their position in preorder, which is used to break ties between candidates.
+    # nodes are removed from the index as they are matched.
+    unmatched_y: dict[type[Node], dict[Node, int]] = defaultdict(dict)
+    for position, node_y in enumerate(root_y.nodes()):
+        if not mappings.destination_is_mapped(node_y):
+            unmatched_y[type(node_y)][node_y] = position
+
+    def find_candidates(node: Node) -> list[Node]:
+        # A node c ∈ T2 is a candidate for t1 if label(t1) = label(c), c is unmatched, and t1
+        # and c have some matching descendants.
+        # - such candidates are the ancestors of the partners of the descendants of t1
+        unmatched_y_of_type = unmatched_y[type(node)]
+        ancestors_y: set[Node] = set()
+        for descendant in node.descendants():
+            partner = mappings.source_is_mapped_to(descendant)
+            if partner is None:
+                continue
+            ancestor = partner.parent
+            while ancestor is not None and ancestor not in ancestors_y:
+                ancestors_y.add(ancestor)
+                ancestor = ancestor.parent
+
+        candidates = [node_y for node_y in ancestors_y if node_y in unmatched_y_of_type]
+
+        # candidates without matching descendants have a dice score of zero
+        if not candidates and min_dice <= 0:
+            candidates = list(unmatched_y_of_type)
+
+        candidates.sort(key=unmatched_y_of_type.__getitem__)
+        return candidates
+
     # to find the container mappings, the nodes of T1 are processed in postorder
     # for each unmatched non-leaf node of T1, we extract a list of candidate nodes from T2
     def visit(node: Node) -> None:
@@ -218,58 +425,93 @@ def compute_bottom_up_mappings(
         if not node.has_children():
             return
 
-        # A node c ∈ T2 is a candidate for t1 if label(t1) = label(c), c is unmatched, and t1
-        # and c have some matching descendants.
-        candidates: list[Node] = [
-            node_y
-            for node_y in root_y.nodes()
-            if not mappings.destination_is_mapped(node_y) and type(node) == type(node_y)
-        ]
-
+        candidates = find_candidates(node)
         if not candidates:
             return
 
-        candidates.sort(
-            key=lambda node_y: dice(node, node_y, mappings),
-            reverse=True,
-        )
+        # find the candidate with the highest score, preferring earlier candidates in case of a tie
         top_candidate = candidates[0]
-
-        score = dice(node, top_candidate, mappings)
-        if score >= min_dice:
+        top_score = dice(node, top_candidate, mappings)
+        for candidate in candidates[1:]:
+            score = dice(node, candidate, mappings)
+            if score > top_score:
+                top_candidate = candidate
+                top_score = score
+
+        if top_score >= min_dice:
             mappings.add(node, top_candidate)
+            del unmatched_y[type(node)][top_candidate]
 
-    for node in root_x.postorder():
-        visit(node)
+            if max(node.size(), top_candidate.size()) < max_size:
+                recover(node, top_candidate)
 
     # When two nodes matches, we finally apply an optimal algorithm to search for
     # additional mappings (called recovery mappings) among their descendants.
-    # - uses RTED without move actions
+    # - uses Zhang-Shasha without move actions
+    def recover(node_x: Node, node_y: Node) -> None:
+        for descendant_x, descendant_y in tree_edit_mappings(node_x, node_y, _recovery_rename_cost):
+            if mappings.source_is_mapped(descendant_x) or mappings.destination_is_mapped(descendant_y):
+                continue
+            logger.debug("recovered mapping: {} -> {}", descendant_x.id_, descendant_y.id_)
+            mappings.add(descendant_x, descendant_y)
+            del unmatched_y[type(descendant_y)][descendant_y]
+
+    for node in root_x.postorder():
+        visit(node)
 
     return mappings
 
 
+def _describe_mappings(mappings: NodeMappings) -> str:
+    return "\n".join(f"* {node_from.id_} -> {node_to.id_}" for (node_from, node_to) in mappings)
+
+
 def compute_gumtree_mappings(
     root_x: Node,
     root_y: Node,
     *,
     min_height: int = 1,
     min_dice: float = 0.5,
+    max_size: int = 100,
+    match_ids: bool = False,
+    verification: VerificationLevel | None = None,
 ) -> NodeMappings:
-    """Uses the GumTree algorithm to map nodes between two trees."""
-    mappings = compute_topdown_mappings(root_x, root_y, min_height=min_height)
-    logger.trace(
-        "sanity checking top-down mappings:\n{}",
-        "\n".join(f"* {node_from.id_} -> {node_to.id_}" for (node_from, node_to) in mappings),
-    )
-    mappings.check()
-
-    mappings = compute_bottom_up_mappings(root_x, root_y, mappings, min_dice=min_dice)
-    logger.trace(
-        "sanity checking complete mappings:\n{}",
-        "\n".join(f"* {node_from.id_} -> {node_to.id_}" for (node_from, node_to) in mappings),
-    )
-    mappings.check()
+    """Uses the GumTree algorithm to map nodes between two trees.
+
+    If match_ids is True, nodes that share an ID are mapped up front (see compute_id_mappings),
+    and GumTree only searches the remaining unmapped regions of each tree. This is intended for
+    successive snapshots of the same program, whose blocks keep their IDs.
+
+    The mappings are checked after each phase if the verification level is FULL
+    (by default, the level given by get_verification_level).
+    """
+    verification = resolve_verification_level(verification)
+
+    mappings: NodeMappings | None = None
+    if match_ids:
+        with trace_phase("gumtree.id-mappings") as event:
+            mappings = compute_id_mappings(root_x, root_y)
+            event["mappings"] = len(mappings)
+
+    with trace_phase("gumtree.top-down") as event:
+        mappings = compute_topdown_mappings(root_x, root_y, min_height=min_height, mappings=mappings)
+        event["nodes_x"] = root_x.size()
+        event["nodes_y"] = root_y.size()
+        event["mappings"] = len(mappings)
+    logger.opt(lazy=True).trace("sanity checking top-down mappings:\n{}", lambda: _describe_mappings(mappings))
+    verify_mappings(mappings, verification)
+
+    with trace_phase("gumtree.bottom-up") as event:
+        mappings = compute_bottom_up_mappings(
+            root_x,
+            root_y,
+            mappings,
+            min_dice=min_dice,
+            max_size=max_size,
+        )
+        event["mappings"] = len(mappings)
+    logger.opt(lazy=True).trace("sanity checking complete mappings:\n{}", lambda: _describe_mappings(mappings))
+    verify_mappings(mappings, verification)
 
     # ensure root is mapped
     mappings.add(root_x, root_y)
@@ -290,6 +532,6 @@ def compute_gumtree_mappings(
                 if top_level_x.id_ == top_level_y.id_:
                     mappings.add(top_level_x, top_level_y)
 
-    mappings.check()
+    verify_mappings(mappings, verification)
 
     return mappings
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import itertools
 import json
+import sys
 import typing as t
 from pathlib import Path
 
-import networkx as nx
 from loguru import logger
 
 from facilitate.model.block import Block
@@ -14,6 +13,7 @@ from facilitate.model.input import Input
 from facilitate.model.literal import Literal
 from facilitate.model.program import Program
 from facilitate.model.sequence import Sequence
+from facilitate.tracing import trace_phase
 
 if t.TYPE_CHECKING:
     from facilitate.model.node import Node
@@ -23,19 +23,39 @@ _NodeDescription = dict[str, t.Any]
 _INPUT_VALUE_ARRAY_LENGTH = 2
 
 
+_T = t.TypeVar("_T")
+
+
+def _intern(value: _T) -> _T:
+    """Interns string values (e.g., opcodes and names), which recur across many nodes and programs."""
+    if isinstance(value, str):
+        return t.cast(_T, sys.intern(value))
+    return value
+
+
 def _toposort(
     id_to_node_description: dict[str, _NodeDescription],
 ) -> list[_NodeDescription]:
+    """Orders node descriptions such that each parent precedes its children."""
     expected_num_nodes = len(id_to_node_description)
-    graph = nx.DiGraph()
+
+    # NOTE nodes are ordered by their first mention, either as a node or as a parent
+    id_to_children: dict[str, list[str]] = {}
     for id_, description in id_to_node_description.items():
-        graph.add_node(id_)
+        id_to_children.setdefault(id_, [])
         parent_id: str | None = description["parent"]
         if parent_id:
-            graph.add_edge(parent_id, id_)
+            id_to_children.setdefault(parent_id, []).append(id_)
+
+    # visit the nodes generation by generation, starting with those that have no parent
+    sorted_ids: list[str] = []
+    generation = [
+        id_ for id_ in id_to_children if not id_to_node_description[id_]["parent"]
+    ]
+    while generation:
+        sorted_ids.extend(generation)
+        generation = [child for id_ in generation for child in id_to_children[id_]]
 
-    # NOTE networkx stubs are incorrect here; topological_sort returns a generator
-    sorted_ids = list(nx.topological_sort(graph))  # type: ignore
     sorted_descriptions = [id_to_node_description[id_] for id_ in sorted_ids]
     actual_num_nodes = len(sorted_descriptions)
 
@@ -69,62 +89,53 @@ def _inject_parent_into_block_descriptions(
 def _join_sequences(
     sequences: list[list[str]],
 ) -> list[list[str]]:
-    """If the end of one sequence is the start of another, join them together."""
-    sequences = [sequence.copy() for sequence in sequences]
-    expected_items = {id_ for sequence in sequences for id_ in sequence}
+    """If the end of one sequence is the start of another, join them together.
 
-    while True:
-        for seq_x, seq_y in itertools.product(sequences, repeat=2):
-            if not seq_x or not seq_y:
-                continue
-            if seq_x[-1] == seq_y[0]:
-                seq_x.extend(seq_y[1:])
-                seq_y.clear()
-            elif seq_y[-1] == seq_x[0]:
-                seq_y.extend(seq_x[1:])
-                seq_x.clear()
+    Joined sequences are returned in the order in which their first fragment appears.
+    """
+    expected_items = {id_ for sequence in sequences for id_ in sequence}
 
-        # destroy empty sequences
-        updated_sequences = [sequence.copy() for sequence in sequences if sequence]
+    # index each fragment by its first ID and determine which fragments continue another
+    start_to_sequence: dict[str, list[str]] = {}
+    for sequence in sequences:
+        start_to_sequence.setdefault(sequence[0], sequence)
+    continuations = {sequence[-1] for sequence in sequences}
 
-        # keep joining sequences until reaching a fixed point
-        if updated_sequences == sequences:
-            break
-        sequences = updated_sequences
+    # walk each chain of fragments once, starting from its head
+    joined: list[list[str]] = []
+    for sequence in sequences:
+        if sequence[0] in continuations:
+            continue
+        chain = sequence.copy()
+        visited = {chain[0]}
+        while chain[-1] not in visited and chain[-1] in start_to_sequence:
+            visited.add(chain[-1])
+            chain.extend(start_to_sequence[chain[-1]][1:])
+        joined.append(chain)
 
     # ensure that no IDs were lost during joining
-    actual_items = {id_ for sequence in sequences for id_ in sequence}
+    actual_items = {id_ for sequence in joined for id_ in sequence}
     assert actual_items == expected_items
-    return sequences
+    return joined
 
 
 def _extract_sequence_descriptions(
     id_to_node_description: dict[str, _NodeDescription],
 ) -> list[_NodeDescription]:
-    sequences: list[list[str]] = []
-
-    for id_, description in id_to_node_description.items():
-        next_id = description["next"]
-        if not next_id:
-            continue
-        for sequence in sequences:
-            if sequence[-1] == id_:
-                sequence.append(next_id)
-                break
-        else:
-            sequences.append([id_, next_id])
+    # each block with a successor forms a two-block fragment of a sequence
+    sequences: list[list[str]] = [
+        [id_, description["next"]]
+        for id_, description in id_to_node_description.items()
+        if description["next"]
+    ]
 
     # join together sequence fragments
-    logger.trace(
-        "extracted initial {} sequences:\n{}",
-        len(sequences),
-        "\n".join(" > ".join(sequence) for sequence in sequences),
-    )
+    logger.trace("extracted {} sequence fragments", len(sequences))
     sequences = _join_sequences(sequences)
-    logger.trace(
+    logger.opt(lazy=True).trace(
         "extracted {} sequences:\n{}",
-        len(sequences),
-        "\n".join(" > ".join(sequence) for sequence in sequences),
+        lambda: len(sequences),
+        lambda: "\n".join(" > ".join(sequence) for sequence in sequences),
     )
 
     descriptions: list[_NodeDescription] = []
@@ -185,16 +196,16 @@ def _build_input(
         expression = id_to_node[value_array[1]]
     elif isinstance(value_array[1], list):
         assert len(value_array[1]) == _INPUT_VALUE_ARRAY_LENGTH
-        literal_value = value_array[1][1]
+        literal_value = _intern(value_array[1][1])
         expression = Literal.create(literal_value)
     elif value_array[1] is None:
-        logger.trace(f"input {name} has no expression")
+        logger.trace("input {} has no expression", name)
         return None
     else:
         error = f"invalid input value: {value_array[1]}"
         raise TypeError(error)
 
-    return Input.create(name, expression)
+    return Input.create(_intern(name), expression)
 
 
 def _build_program_from_node_descriptions(
@@ -220,15 +231,15 @@ def _build_program_from_node_descriptions(
 
             fields: list[Field] = [
                 Field.create(
-                    name=name,
-                    value=value_arr[0],
+                    name=_intern(name),
+                    value=_intern(value_arr[0]),
                 )
                 for name, value_arr in description["fields"].items()
             ]
 
             block = Block(
                 id_=id_,
-                opcode=description["opcode"],
+                opcode=_intern(description["opcode"]),
                 parent=None,
                 fields=fields,
                 inputs=inputs,
@@ -291,40 +302,44 @@ def _remove_inactive_blocks(
 def load_program_from_block_descriptions(
     id_to_raw_description: dict[str, _NodeDescription],
 ) -> Program:
-    # inject an ID into each block description and denote as a block
-    id_to_node_description = {
-        id_: {
-            "id_": id_,
-            "type": "block",
-            "previous": None,
-        } | description
-        for id_, description in id_to_raw_description.items()
-    }
-    logger.trace("injected ID into block descriptions")
-    logger.trace("program description contains {} blocks", len(id_to_node_description))
-
-    id_to_node_description = _remove_inactive_blocks(id_to_node_description)
-    logger.trace(
-        "removed inactive blocks from program description: contains {} blocks",
-        len(id_to_node_description),
-    )
-
-    _inject_parent_into_block_descriptions(id_to_node_description)
-    logger.trace("injected corrected parent field into block descriptions")
-
-    sequence_descriptions = _extract_sequence_descriptions(id_to_node_description)
-    for description in sequence_descriptions:
-        sequence_id = description["id_"]
-        id_to_node_description[sequence_id] = description
-        for block_id in description["blocks"]:
-            block_parent_id = id_to_node_description[block_id]["parent"]
-            assert block_parent_id == sequence_id
+    with trace_phase("loader.load") as event:
+        event["blocks"] = len(id_to_raw_description)
+
+        # inject an ID into each block description and denote as a block
+        id_to_node_description = {
+            id_: {
+                "id_": id_,
+                "type": "block",
+                "previous": None,
+            } | description
+            for id_, description in id_to_raw_description.items()
+        }
+        logger.trace("injected ID into block descriptions")
+        logger.trace("program description contains {} blocks", len(id_to_node_description))
+
+        id_to_node_description = _remove_inactive_blocks(id_to_node_description)
+        event["active_blocks"] = len(id_to_node_description)
+        logger.trace(
+            "removed inactive blocks from program description: contains {} blocks",
+            len(id_to_node_description),
+        )
+
+        _inject_parent_into_block_descriptions(id_to_node_description)
+        logger.trace("injected corrected parent field into block descriptions")
+
+        sequence_descriptions = _extract_sequence_descriptions(id_to_node_description)
+        for description in sequence_descriptions:
+            sequence_id = description["id_"]
+            id_to_node_description[sequence_id] = description
+            for block_id in description["blocks"]:
+                block_parent_id = id_to_node_description[block_id]["parent"]
+                assert block_parent_id == sequence_id
 
-    # update block reference in "inputs" fields for the start of each sequence
-    _fix_input_block_references(sequence_descriptions, id_to_node_description)
-    logger.trace("fixed input block references to account for sequences")
+        # update block reference in "inputs" fields for the start of each sequence
+        _fix_input_block_references(sequence_descriptions, id_to_node_description)
+        logger.trace("fixed input block references to account for sequences")
 
-    return _build_program_from_node_descriptions(id_to_node_description)
+        return _build_program_from_node_descriptions(id_to_node_description)
 
 
 def load_from_file(filename_or_path: str | Path) -> Program:
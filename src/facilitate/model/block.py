@@ -17,7 +17,7 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Block(Node):
     opcode: str
     fields: list[Field] = dataclasses.field(default_factory=list)
@@ -51,14 +51,15 @@ class Block(Node):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
             opcode=self.opcode,
-            tags=self.tags.copy(),
+            tag_flags=self.tag_flags,
             fields=[field.copy() for field in self.fields],
             inputs=[input_.copy() for input_ in self.inputs],
             is_shadow=self.is_shadow,
         )
+        return self._with_cached_digest(copied)
 
     def _fields_are_equivalent(self, other: Block) -> bool:
         """Determines whether the fields of this block are equivalent to those of another."""
@@ -69,7 +70,7 @@ class Block(Node):
             other.fields,
             strict=True,
         ):
-            if not field.equivalent_to(other_field):
+            if not field.equivalent_to(other_field, deep=True):
                 return False
         return True
 
@@ -82,7 +83,7 @@ class Block(Node):
             other.inputs,
             strict=True,
         ):
-            if not input_.equivalent_to(other_input):
+            if not input_.equivalent_to(other_input, deep=True):
                 return False
         return True
 
@@ -91,7 +92,11 @@ class Block(Node):
         return isinstance(other, Block) and self.opcode == other.opcode
 
     @overrides
-    def equivalent_to(self, other: Node) -> bool:
+    def _digest_label(self) -> list[t.Any]:
+        return ["block", self.opcode]
+
+    @overrides
+    def _structurally_equivalent_to(self, other: Node) -> bool:
         """Determines whether this block is equivalent to another."""
         if not self.surface_equivalent_to(other):
             return False
@@ -104,7 +109,8 @@ class Block(Node):
         return self._inputs_are_equivalent(other)
 
     def __post_init__(self) -> None:
-        super().__post_init__()
+        # NOTE zero-argument super() does not work within slotted dataclasses
+        Node.__post_init__(self)
         self.fields.sort(key=lambda field: field.name)
         self.inputs.sort(key=lambda input_: input_.name)
 
@@ -128,6 +134,7 @@ class Block(Node):
 
         # insert field in alphabetical order
         bisect.insort(self.fields, field, key=lambda field: field.name)
+        self._child_attached(field)
         return field
 
     def find_input(self, name: str) -> Input | None:
@@ -150,6 +157,7 @@ class Block(Node):
 
         # insert input in alphabetical order
         bisect.insort(self.inputs, input_, key=lambda input_: input_.name)
+        self._child_attached(input_)
         return input_
 
     def add_child(self, child: Node) -> Node:
@@ -163,6 +171,7 @@ class Block(Node):
             error = f"cannot add child {child.id_}: not field or input"
             raise TypeError(error)
 
+        self._child_attached(child)
         return child
 
     @overrides
@@ -176,6 +185,7 @@ class Block(Node):
             raise TypeError(error)
 
         child.parent = None
+        self._child_detached(child)
 
     @overrides
     def children(self) -> t.Iterator[Node]:
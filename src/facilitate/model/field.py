@@ -12,7 +12,7 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Field(TerminalNode):
     """Fields store specific values, options, or settings that customize the behavior or appearance of a block."""
     name: str
@@ -39,12 +39,17 @@ class Field(TerminalNode):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
-            tags=self.tags.copy(),
+            tag_flags=self.tag_flags,
             name=self.name,
             value=self.value,
         )
+        return self._with_cached_digest(copied)
+
+    @overrides
+    def _digest_label(self) -> list[t.Any]:
+        return ["field", self.name, self.value]
 
     @overrides
     def surface_equivalent_to(self, other: Node) -> bool:
@@ -14,7 +14,7 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Input(Node):
     name: str
     _children: list[Node] = field(default_factory=list)
@@ -51,6 +51,7 @@ class Input(Node):
         assert child not in self._children
         child.parent = self
         self._children.append(child)
+        self._child_attached(child)
 
     @classmethod
     def determine_id(cls, block_id: str, input_name: str) -> str:
@@ -58,19 +59,24 @@ class Input(Node):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
-            tags=self.tags.copy(),
+            tag_flags=self.tag_flags,
             name=self.name,
             _children=[child.copy() for child in self._children],
         )
+        return self._with_cached_digest(copied)
 
     @overrides
     def surface_equivalent_to(self, other: Node) -> bool:
         return isinstance(other, Input) and self.name == other.name
 
     @overrides
-    def equivalent_to(self, other: Node) -> bool:
+    def _digest_label(self) -> list[t.Any]:
+        return ["input", self.name]
+
+    @overrides
+    def _structurally_equivalent_to(self, other: Node) -> bool:
         if not self.surface_equivalent_to(other):
             return False
         assert isinstance(other, Input)
@@ -79,7 +85,7 @@ class Input(Node):
             return False
 
         return all(
-            child.equivalent_to(other_child)
+            child.equivalent_to(other_child, deep=True)
             for child, other_child
             in zip(self._children, other._children, strict=True)
         )
@@ -95,6 +101,7 @@ class Input(Node):
             raise ValueError(error)
         child.parent = None
         self._children.remove(child)
+        self._child_detached(child)
 
     @overrides
     def _add_to_nx_digraph(self, graph: nx.DiGraph) -> None:
@@ -12,7 +12,7 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Literal(TerminalNode):
     """Represents a literal value within the AST."""
     value: str
@@ -32,11 +32,16 @@ class Literal(TerminalNode):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
-            tags=self.tags.copy(),
+            tag_flags=self.tag_flags,
             value=self.value,
         )
+        return self._with_cached_digest(copied)
+
+    @overrides
+    def _digest_label(self) -> list[t.Any]:
+        return ["literal", self.value]
 
     @overrides
     def surface_equivalent_to(self, other: Node) -> bool:
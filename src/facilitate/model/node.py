@@ -3,32 +3,82 @@ from __future__ import annotations
 __all__ = ("Node", "TerminalNode")
 
 import abc
-import tempfile
+import hashlib
+import json
 import typing as t
 from dataclasses import dataclass, field
-from functools import cached_property
 from pathlib import Path
 
-import networkx as nx
-import PIL.Image
 from overrides import final, overrides
 
+from facilitate import algorithms
+from facilitate.model.tag import Tag, TagNames
 
-@dataclass(kw_only=True, eq=False)
+# NOTE visualization dependencies are imported on demand to keep the import time of the server low
+if t.TYPE_CHECKING:
+    import networkx as nx
+    import PIL.Image
+
+
+@dataclass(eq=False)
+class _Numbering:
+    """A preorder numbering of the nodes in a tree.
+
+    A numbering is shared by all of the nodes that it numbers and becomes invalid as soon as
+    the structure of the tree changes.
+    """
+    nodes: list[Node] = field(default_factory=list)
+    is_valid: bool = True
+
+
+@dataclass(kw_only=True, eq=False, slots=True)
 class Node(abc.ABC):
     """Represents a node in the abstract syntax tree."""
     id_: str
     parent: Node | None = None
-    tags: list[str] = field(default_factory=list)
+    tag_flags: Tag = Tag.NONE
+    _digest: bytes | None = field(default=None, init=False, repr=False)
+    _numbering: _Numbering | None = field(default=None, init=False, repr=False)
+    _preorder_start: int = field(default=0, init=False, repr=False)
+    _preorder_end: int = field(default=0, init=False, repr=False)
+    _height: int = field(default=1, init=False, repr=False)
+    _size: int = field(default=1, init=False, repr=False)
 
     def __post_init__(self) -> None:
+        # NOTE children are always constructed before their parents, so their heights and sizes are known
+        size = 1
+        max_child_height = 0
         for child in self.children():
             child.parent = self
-
-    def add_tag_to_subtree(self, tag: str) -> None:
+            size += child._size
+            max_child_height = max(max_child_height, child._height)
+        self._size = size
+        self._height = max_child_height + 1
+
+    @property
+    def tags(self) -> TagNames:
+        """A list-like view of the names of the tags of this node."""
+        return TagNames(self)
+
+    @tags.setter
+    def tags(self, names: t.Iterable[str]) -> None:
+        self.tag_flags = Tag.NONE
+        for name in names:
+            self.add_tag(name)
+
+    def add_tag(self, tag: Tag | str) -> None:
+        """Adds a tag (or the tag with a given name) to this node."""
+        self.tag_flags |= Tag.coerce(tag)
+
+    def has_tag(self, tag: Tag | str) -> bool:
+        """Determines whether this node has a given tag."""
+        return Tag.coerce(tag) in self.tag_flags
+
+    def add_tag_to_subtree(self, tag: Tag | str) -> None:
         """Adds a tag to all of the nodes in the subtree rooted at this node."""
+        tag = Tag.coerce(tag)
         for node in self.nodes():
-            node.tags.append(tag)
+            node.tag_flags |= tag
 
     @abc.abstractmethod
     def is_valid(self) -> bool:
@@ -40,21 +90,181 @@ class Node(abc.ABC):
         """Creates a deep copy of this node."""
         raise NotImplementedError
 
-    @cached_property
+    def _with_cached_digest(self: t.Self, copied: t.Self) -> t.Self:
+        """Gives a copy of this node the digest that this node has already computed, if any."""
+        copied._digest = self._digest
+        return copied
+
+    @property
     def height(self) -> int:
-        """The height of the subtree rooted at this node."""
-        max_child_height = 0
-        for child in self.children():
-            max_child_height = max(max_child_height, child.height)
-        return max_child_height + 1
+        """The height of the subtree rooted at this node.
+
+        The height is stored and is kept up to date as children are attached and detached.
+        """
+        return self._height
 
     def size(self) -> int:
-        """The size of the subtree rooted at this node."""
-        return sum(1 for _ in self.nodes())
+        """The size of the subtree rooted at this node.
+
+        The size is stored and is kept up to date as children are attached and detached.
+        """
+        return self._size
+
+    def _update_height_and_size(self, size_change: int) -> None:
+        """Updates the height and size of this node and each of its ancestors.
+
+        Must be called after a child has been attached or detached, given the resulting change in
+        the size of the subtree rooted at this node.
+        """
+        node: Node | None = self
+        update_height = True
+        while node is not None:
+            node._size += size_change
+            # the heights of the remaining ancestors need not be recomputed once a height is unchanged
+            if update_height:
+                height = 1 + max((child._height for child in node.children()), default=0)
+                update_height = height != node._height
+                node._height = height
+            node = node.parent
 
     @abc.abstractmethod
-    def equivalent_to(self, other: Node) -> bool:
-        """Determines whether this node is equivalent to another."""
+    def _digest_label(self) -> list[t.Any]:
+        """Returns the surface-level attributes of this node that contribute to its digest."""
+        raise NotImplementedError
+
+    @property
+    def digest(self) -> bytes:
+        """A structural digest of the subtree rooted at this node.
+
+        Equivalent subtrees share the same digest.
+        The digest is cached and is invalidated whenever the subtree is modified.
+        """
+        if self._digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            # NOTE the label is ASCII-encoded JSON and can never contain a NUL byte
+            hasher.update(json.dumps(self._digest_label()).encode())
+            hasher.update(b"\x00")
+            for child in self.children():
+                hasher.update(child.digest)
+            self._digest = hasher.digest()
+        return self._digest
+
+    def invalidate_digest(self) -> None:
+        """Invalidates the cached digest of this node and each of its ancestors.
+
+        Must be called whenever the surface-level attributes or children of this node change.
+        """
+        node: Node | None = self
+        # if a node has no cached digest, neither do any of its ancestors
+        while node is not None and node._digest is not None:
+            node._digest = None
+            node = node.parent
+
+    def number_nodes(self) -> None:
+        """Numbers the nodes within the subtree rooted at this node in preorder.
+
+        Each node is assigned the interval of preorder positions that is spanned by its subtree,
+        which allows contains and numbered_descendants to run without traversing the subtree.
+        The numbering is discarded as soon as the structure of the tree is modified.
+        """
+        numbering = _Numbering()
+        stack: list[tuple[Node, bool]] = [(self, False)]
+        while stack:
+            node, is_exit = stack.pop()
+            if is_exit:
+                node._preorder_end = len(numbering.nodes)
+                continue
+            # any numbering that previously included this node can no longer be kept up to date
+            if node._numbering is not None:
+                node._numbering.is_valid = False
+            node._numbering = numbering
+            node._preorder_start = len(numbering.nodes)
+            numbering.nodes.append(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(list(node.children())))
+
+    def is_numbered(self) -> bool:
+        """Determines whether this node belongs to a valid preorder numbering."""
+        return self._numbering is not None and self._numbering.is_valid
+
+    def precompute_caches(self) -> None:
+        """Computes the digests and preorder numbering of the subtree rooted at this node.
+
+        Both are otherwise computed on first use. Once they have been computed, reading the tree
+        (e.g., as the target of an edit script) no longer writes to it, which allows the tree to be
+        shared by concurrent readers for as long as it is not modified.
+        """
+        _ = self.digest
+        if not self.is_numbered():
+            self.number_nodes()
+
+    def numbered_descendants(self) -> list[Node]:
+        """Returns the descendants of this node in preorder using its numbering.
+
+        Raises
+        ------
+        ValueError
+            if this node does not belong to a valid preorder numbering
+        """
+        if self._numbering is None or not self._numbering.is_valid:
+            error = f"node is not numbered: {self.id_}"
+            raise ValueError(error)
+        return self._numbering.nodes[self._preorder_start + 1:self._preorder_end]
+
+    def _invalidate_numbering(self) -> None:
+        """Invalidates the preorder numbering (if any) of the tree that contains this node."""
+        if self._numbering is not None:
+            self._numbering.is_valid = False
+            self._numbering = None
+
+    def _node_index(self) -> dict[str, Node] | None:
+        """Returns the ID-to-node index maintained by this node, if it is the root of an indexed tree."""
+        return None
+
+    def _root_node_index(self) -> dict[str, Node] | None:
+        """Returns the ID-to-node index of the tree that contains this node, if there is one."""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root._node_index()
+
+    def _child_attached(self, child: Node) -> None:
+        """Must be called after a child (and its subtree) has been attached to this node."""
+        self.invalidate_digest()
+        self._invalidate_numbering()
+        self._update_height_and_size(child._size)
+        index = self._root_node_index()
+        if index is not None:
+            for node in child.nodes():
+                index.setdefault(node.id_, node)
+
+    def _child_detached(self, child: Node) -> None:
+        """Must be called after a child (and its subtree) has been detached from this node."""
+        self.invalidate_digest()
+        self._invalidate_numbering()
+        self._update_height_and_size(-child._size)
+        index = self._root_node_index()
+        if index is not None:
+            for node in child.nodes():
+                if index.get(node.id_) is node:
+                    del index[node.id_]
+
+    @final
+    def equivalent_to(self, other: Node, *, deep: bool = False) -> bool:
+        """Determines whether this node is equivalent to another.
+
+        By default, equivalence is determined by comparing the digests of both nodes.
+        If deep is set, the subtrees are also compared node by node.
+        """
+        if self.digest != other.digest:
+            return False
+        if deep:
+            return self._structurally_equivalent_to(other)
+        return True
+
+    @abc.abstractmethod
+    def _structurally_equivalent_to(self, other: Node) -> bool:
+        """Determines whether this node is equivalent to another by comparing both subtrees."""
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -79,14 +289,26 @@ class Node(abc.ABC):
 
     @final
     def descendants(self) -> t.Iterator[Node]:
-        """Iterates over all descendants of this node."""
-        for child in self.children():
-            yield child
-            yield from child.descendants()
+        """Iterates over all descendants of this node in preorder.
+
+        If this node is numbered, its numbering is used as a cached, flattened preorder.
+        """
+        numbering = self._numbering
+        if numbering is not None and numbering.is_valid:
+            return iter(numbering.nodes[self._preorder_start + 1:self._preorder_end])
+        nodes = algorithms.preorder(self)
+        next(nodes)
+        return nodes
 
     @final
     def contains(self, node: Node) -> bool:
-        """Determines whether the given node is a descendant of this node."""
+        """Determines whether the given node is a descendant of this node.
+
+        If both nodes share a valid preorder numbering, this takes constant time.
+        """
+        numbering = self._numbering
+        if numbering is not None and numbering.is_valid and node._numbering is numbering:
+            return self._preorder_start < node._preorder_start < self._preorder_end
         return node in self.descendants()
 
     def find(self, id_: str) -> Node | None:
@@ -104,17 +326,19 @@ class Node(abc.ABC):
 
     @final
     def nodes(self) -> t.Iterator[Node]:
-        """Iterates over all nodes within the subtree rooted at this node."""
-        yield self
-        yield from self.descendants()
+        """Iterates over all nodes within the subtree rooted at this node in preorder.
+
+        If this node is numbered, its numbering is used as a cached, flattened preorder.
+        """
+        numbering = self._numbering
+        if numbering is not None and numbering.is_valid:
+            return iter(numbering.nodes[self._preorder_start:self._preorder_end])
+        return algorithms.preorder(self)
 
     @final
     def postorder(self) -> t.Iterator[Node]:
         """Iterates over all nodes within the subtree rooted at this node in postorder."""
-        children = list(self.children())
-        for child in children:
-            yield from child.postorder()
-        yield self
+        return algorithms.postorder(self)
 
     @abc.abstractmethod
     def remove_child(self, child: Node) -> None:
@@ -125,19 +349,19 @@ class Node(abc.ABC):
         """Returns the attributes of this node to be used in a NetworkX graph."""
         attributes: dict[str, str] = {}
 
-        if "UPDATED" in self.tags:
+        if Tag.UPDATED in self.tag_flags:
             attributes["fillcolor"] = "blue"
             attributes["style"] = "filled"
             attributes["fontcolor"] = "white"
-        if "DELETED" in self.tags:
+        if Tag.DELETED in self.tag_flags:
             attributes["fillcolor"] = "red"
             attributes["style"] = "filled"
             attributes["fontcolor"] = "white"
-        if "ADDED" in self.tags:
+        if Tag.ADDED in self.tag_flags:
             attributes["fillcolor"] = "green"
             attributes["style"] = "filled"
             attributes["fontcolor"] = "black"
-        if "MOVED" in self.tags:
+        if Tag.MOVED in self.tag_flags:
             attributes["fillcolor"] = "purple"
             attributes["style"] = "filled"
             attributes["fontcolor"] = "white"
@@ -152,17 +376,25 @@ class Node(abc.ABC):
     @final
     def to_nx_digraph(self) -> nx.DiGraph:
         """Converts the graph rooted as this node to an NetworkX DiGraph."""
+        import networkx as nx
+
         graph = nx.DiGraph()
         self._add_to_nx_digraph(graph)
         return graph
 
     def to_dot(self, filename: str) -> None:
         """Writes the graph rooted as this node to a DOT file."""
+        import networkx as nx
+
         graph = self.to_nx_digraph()
         nx.drawing.nx_pydot.write_dot(graph, filename)
 
     def to_dot_pil_image(self) -> PIL.Image.Image:
         """Renders the graph rooted as this node to a PIL image."""
+        import tempfile
+
+        import PIL.Image
+
         png_filename = tempfile.mkstemp(suffix=".png")[1]
         png_path = Path(png_filename)
         try:
@@ -173,23 +405,29 @@ class Node(abc.ABC):
 
     def to_dot_png(self, filename: str) -> None:
         """Writes the graph rooted as this node to a PNG file."""
+        import networkx as nx
+
         graph = self.to_nx_digraph()
         nx.drawing.nx_pydot.to_pydot(graph).write_png(filename)  # type: ignore
 
     def to_dot_pdf(self, filename: str) -> None:
         """Writes the graph rooted as this node to a PDF file."""
+        import networkx as nx
+
         graph = self.to_nx_digraph()
         nx.drawing.nx_pydot.to_pydot(graph).write_pdf(filename)  # type: ignore
 
 
 class TerminalNode(Node, abc.ABC):
     """Represents a node in the abstract syntax tree that has no children."""
+    __slots__ = ()
+
     @overrides
     def children(self) -> t.Iterator[Node]:
         yield from []
 
     @overrides
-    def equivalent_to(self, other: Node) -> bool:
+    def _structurally_equivalent_to(self, other: Node) -> bool:
         return self.surface_equivalent_to(other)
 
     @overrides
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from overrides import overrides
 
@@ -14,13 +14,29 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Program(Node):
     top_level_nodes: list[Sequence]
+    _id_to_node: dict[str, Node] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # NOTE zero-argument super() does not work within slotted dataclasses
+        Node.__post_init__(self)
+        for node in self.nodes():
+            self._id_to_node.setdefault(node.id_, node)
 
     def __hash__(self) -> int:
         return hash(self.id_)
 
+    @overrides
+    def _node_index(self) -> dict[str, Node] | None:
+        return self._id_to_node
+
+    @overrides
+    def find(self, id_: str) -> Node | None:
+        """Finds the node with the given ID within this program using its index."""
+        return self._id_to_node.get(id_)
+
     @overrides
     def is_valid(self) -> bool:
         if not all(isinstance(node, Sequence) for node in self.top_level_nodes):
@@ -29,11 +45,12 @@ class Program(Node):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
-            tags=self.tags.copy(),
+            tag_flags=self.tag_flags,
             top_level_nodes=[node.copy() for node in self.top_level_nodes],
         )
+        return self._with_cached_digest(copied)
 
     @classmethod
     def build(cls, top_level_nodes: list[Node]) -> Program:
@@ -58,7 +75,11 @@ class Program(Node):
         return isinstance(other, Program)
 
     @overrides
-    def equivalent_to(self, other: Node) -> bool:
+    def _digest_label(self) -> list[t.Any]:
+        return ["program"]
+
+    @overrides
+    def _structurally_equivalent_to(self, other: Node) -> bool:
         if not isinstance(other, Program):
             return False
         if len(self.top_level_nodes) != len(other.top_level_nodes):
@@ -68,7 +89,7 @@ class Program(Node):
             other.top_level_nodes,
             strict=True,
         ):
-            if not node.equivalent_to(other_node):
+            if not node.equivalent_to(other_node, deep=True):
                 return False
         return True
 
@@ -83,11 +104,20 @@ class Program(Node):
     def children(self) -> t.Iterator[Node]:
         yield from self.top_level_nodes
 
+    def insert_child(self, child: Node, position: int) -> Sequence:
+        """Inserts an existing sequence into this program at a given position."""
+        assert isinstance(child, Sequence)
+        self.top_level_nodes.insert(position, child)
+        child.parent = self
+        self._child_attached(child)
+        return child
+
     @overrides
     def remove_child(self, child: Node) -> None:
         assert isinstance(child, Sequence)
         self.top_level_nodes.remove(child)
         child.parent = None
+        self._child_detached(child)
 
     @overrides
     def _add_to_nx_digraph(self, graph: nx.DiGraph) -> None:
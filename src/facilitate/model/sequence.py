@@ -13,7 +13,7 @@ if t.TYPE_CHECKING:
     import networkx as nx
 
 
-@dataclass(kw_only=True, eq=False)
+@dataclass(kw_only=True, eq=False, slots=True)
 class Sequence(Node):
     """Represents a sequence of blocks."""
     blocks: list[Block] = field(default_factory=list)
@@ -50,17 +50,22 @@ class Sequence(Node):
 
     @overrides
     def copy(self: t.Self) -> t.Self:
-        return self.__class__(
+        copied = self.__class__(
             id_=self.id_,
             blocks=[block.copy() for block in self.blocks],
         )
+        return self._with_cached_digest(copied)
 
     @overrides
     def surface_equivalent_to(self, other: Node) -> bool:
         return isinstance(other, Sequence)
 
     @overrides
-    def equivalent_to(self, other: Node) -> bool:
+    def _digest_label(self) -> list[t.Any]:
+        return ["sequence"]
+
+    @overrides
+    def _structurally_equivalent_to(self, other: Node) -> bool:
         if not isinstance(other, Sequence):
             return False
         if len(self.blocks) != len(other.blocks):
@@ -70,7 +75,7 @@ class Sequence(Node):
             other.blocks,
             strict=True,
         ):
-            if not block.equivalent_to(other_block):
+            if not block.equivalent_to(other_block, deep=True):
                 return False
         return True
 
@@ -94,9 +99,17 @@ class Sequence(Node):
             is_shadow=is_shadow,
             id_=id_,
         )
-        self.blocks.insert(position, block)
-        block.parent = self
-        return block
+        return self.insert_child(block, position)
+
+    def insert_child(self, child: Node, position: int) -> Block:
+        """Inserts an existing block into this sequence at a given position."""
+        if not isinstance(child, Block):
+            error = f"cannot insert child {child.id_}: not a block."
+            raise TypeError(error)
+        self.blocks.insert(position, child)
+        child.parent = self
+        self._child_attached(child)
+        return child
 
     @overrides
     def remove_child(self, child: Node) -> None:
@@ -105,6 +118,7 @@ class Sequence(Node):
             raise TypeError(error)
         self.blocks.remove(child)
         child.parent = None
+        self._child_detached(child)
 
     def child(self, index: int) -> Node:
         return self.blocks[index]
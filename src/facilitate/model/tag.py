@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import enum
+import typing as t
+from collections.abc import Sequence
+
+if t.TYPE_CHECKING:
+    from facilitate.model.node import Node
+
+
+class Tag(enum.IntFlag):
+    """Marks the ways in which a node has been changed by an edit script (e.g., for visualization).
+
+    The tags of a node are stored as a single integer, rather than as a list of names.
+    """
+    NONE = 0
+    ADDED = enum.auto()
+    DELETED = enum.auto()
+    UPDATED = enum.auto()
+    MOVED = enum.auto()
+
+    @classmethod
+    def from_name(cls, name: str) -> Tag:
+        """Returns the tag with the given name (e.g., "ADDED")."""
+        try:
+            return cls[name]
+        except KeyError:
+            error = f"unknown tag: {name}"
+            raise ValueError(error) from None
+
+    @classmethod
+    def coerce(cls, tag: Tag | str) -> Tag:
+        """Returns the given tag, looking it up by its name if necessary."""
+        return cls.from_name(tag) if isinstance(tag, str) else tag
+
+    def names(self) -> list[str]:
+        """Returns the names of the individual tags within this set of tags."""
+        return [tag.name for tag in Tag if tag and tag in self and tag.name is not None]
+
+
+class TagNames(Sequence[str]):
+    """Provides a list-like view of the names of the tags of a node.
+
+    Supports the string-based API of the list of tag names that nodes previously held
+    (e.g., node.tags.append("ADDED") and "MOVED" in node.tags).
+    Each tag is held at most once.
+    """
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Node) -> None:
+        """Creates a view of the tags of a given node."""
+        self._node = node
+
+    @t.overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        return self._node.tag_flags.names()[index]
+
+    def __len__(self) -> int:
+        return len(self._node.tag_flags.names())
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str) or name not in Tag.__members__:
+            return False
+        return Tag.from_name(name) in self._node.tag_flags
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, name: str) -> None:
+        """Adds the tag with the given name to the node."""
+        self._node.add_tag(name)
+
+    def copy(self) -> list[str]:
+        """Returns the names of the tags as a list."""
+        return list(self)
@@ -0,0 +1,118 @@
+"""Computes the progress of a student program towards a set of reference solutions."""
+from __future__ import annotations
+
+import itertools
+import os
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from facilitate.distance import compute_distance_only, compute_edit_script_and_distance
+
+if t.TYPE_CHECKING:
+    from facilitate.model.program import Program
+
+_Progress = dict[str, t.Any]
+
+
+def compute_progress(
+    user_program: Program,
+    solution_id: int,
+    solution_program: Program,
+    include_edits: bool = True,  # noqa: FBT002
+) -> _Progress:
+    """Computes the progress of a user program towards a given solution.
+
+    If include_edits is False, only the distance is computed, which avoids building an edit script.
+    """
+    if not include_edits:
+        return {
+            "id": solution_id,
+            "distance": compute_distance_only(user_program, solution_program),
+        }
+
+    edit_script, distance = compute_edit_script_and_distance(
+        tree_from=user_program,
+        tree_to=solution_program,
+    )
+    return {
+        "id": solution_id,
+        "distance": distance,
+        "edits": edit_script.to_dict(),
+    }
+
+
+@dataclass
+class ProgressEvaluator:
+    """Evaluates the progress of user programs towards many solutions at once.
+
+    If more than one worker is requested, solutions are evaluated in parallel by a pool of
+    worker processes. Otherwise, or if a pool of processes cannot be created (e.g., on AWS
+    Lambda, which lacks the shared memory that multiprocessing requires), solutions are
+    evaluated serially.
+    """
+    workers: int = 1
+    _executor: ProcessPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_environment(cls) -> ProgressEvaluator:
+        """Configures an evaluator via the FACILITATE_PROGRESS_WORKERS environment variable."""
+        workers = int(os.environ.get("FACILITATE_PROGRESS_WORKERS", "1"))
+        if "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+            workers = 1
+        return cls(workers=workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        """Returns the pool of worker processes, or None if solutions should be evaluated serially."""
+        if self.workers <= 1:
+            return None
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (NotImplementedError, OSError):
+                logger.warning("failed to create process pool: evaluating solutions serially")
+                self.workers = 1
+        return self._executor
+
+    def evaluate(
+        self,
+        user_program: Program,
+        solutions: list[tuple[int, Program]],
+        *,
+        include_edits: bool = True,
+        in_process: bool = False,
+    ) -> list[_Progress]:
+        """Computes the progress towards each (ID, program) solution, in the order given.
+
+        If in_process is set, solutions are evaluated serially in this process, even if a pool of
+        workers is available. This avoids pickling solution programs that have been pre-parsed and
+        are meant to be shared across requests (e.g., those held by a SolutionRegistry).
+        """
+        # each edit script works on its own copy of the user program, and each copy keeps the
+        # digests computed here, so the user program is hashed once rather than once per solution
+        _ = user_program.digest
+
+        executor = None if in_process else self._get_executor()
+        if executor is None or len(solutions) < 2:  # noqa: PLR2004
+            return [
+                compute_progress(user_program, solution_id, solution_program, include_edits)
+                for solution_id, solution_program in solutions
+            ]
+
+        solution_ids = [solution_id for solution_id, _ in solutions]
+        solution_programs = [solution_program for _, solution_program in solutions]
+        return list(executor.map(
+            compute_progress,
+            itertools.repeat(user_program),
+            solution_ids,
+            solution_programs,
+            itertools.repeat(include_edits),
+        ))
+
+    def shutdown(self) -> None:
+        """Shuts down the pool of worker processes, if there is one."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
 import typing as t
 
 import flask
 import flask_cors
-from apiflask import APIFlask, Schema
+from apiflask import APIFlask, HTTPError, Schema
 from apiflask.fields import (
     Boolean,
     DateTime,
@@ -16,14 +18,42 @@ from apiflask.fields import (
     Nested,
     String,
 )
+from loguru import logger
 
 from facilitate.diff import compute_edit_script
-from facilitate.distance import compute_edit_script_and_distance
+from facilitate.distance import compute_distance_only, compute_edit_script_and_distance
 from facilitate.loader import load_program_from_block_descriptions
+from facilitate.progress import ProgressEvaluator
+from facilitate.solutions import RegisteredSolution, SolutionRegistry
+from facilitate.tracing import configure_tracing_from_environment
+
+if t.TYPE_CHECKING:
+    from facilitate.model.program import Program
+
+
+def _configure_logging_from_environment() -> None:
+    """Logs messages at or above the level given by FACILITATE_LOG_LEVEL (default: WARNING).
+
+    Messages below that level are discarded before they are formatted.
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format="<level>{level}:</level> {message}",
+        level=os.environ.get("FACILITATE_LOG_LEVEL", "WARNING"),
+    )
+
 
 app = APIFlask(__name__)
 flask_cors.CORS(app)
 
+solution_registry = SolutionRegistry(
+    max_size=int(os.environ.get("FACILITATE_SOLUTION_CACHE_SIZE", "256")),
+)
+progress_evaluator = ProgressEvaluator.from_environment()
+_configure_logging_from_environment()
+configure_tracing_from_environment()
+
 
 class Block(Schema):
     opcode = String(required=True)
@@ -88,6 +118,31 @@ class ProgressRequest(Schema):
     )
 
 
+class RegisterSolutionsRequest(Schema):
+    solutions = List(
+        Nested(Solution()),
+        required=True,
+    )
+
+
+class RegisteredProgressRequest(Schema):
+    user_program = String(required=True)
+    solution_ids = List(
+        Integer(strict=True),
+        required=True,
+    )
+
+
+class EditsQuery(Schema):
+    edits = Boolean(load_default=True)
+
+
+def _load_program_from_project(jsn_project: str) -> Program:
+    """Loads the program of the first target within a JSON-encoded Scratch project."""
+    jsn_blocks = json.loads(jsn_project)["targets"][0]["blocks"]
+    return load_program_from_block_descriptions(jsn_blocks)
+
+
 @app.put("/diff")  # type: ignore
 @app.input(DiffRequest, location="json")
 def diff(json_data: dict[str, t.Any]) -> flask.Response:
@@ -105,13 +160,23 @@ def diff(json_data: dict[str, t.Any]) -> flask.Response:
 
 @app.put("/distance")  # type: ignore
 @app.input(DiffRequest, location="json")
-def distance(json_data: dict[str, t.Any]) -> flask.Response:
+@app.input(EditsQuery, location="query")
+def distance(
+    json_data: dict[str, t.Any],
+    query_data: dict[str, t.Any],
+) -> flask.Response:
     jsn_from_program = json_data["from_program"]
     jsn_to_program = json_data["to_program"]
 
     from_program = load_program_from_block_descriptions(jsn_from_program)
     to_program = load_program_from_block_descriptions(jsn_to_program)
 
+    if not query_data["edits"]:
+        distance = compute_distance_only(from_program, to_program)
+        response = flask.jsonify({"distance": distance})
+        response.headers.add("Access-Control-Allow-Origin", "*")
+        return response
+
     edit_script, distance = compute_edit_script_and_distance(from_program, to_program)
     response = flask.jsonify({
         "edits": edit_script.to_dict(),
@@ -123,27 +188,68 @@ def distance(json_data: dict[str, t.Any]) -> flask.Response:
 
 @app.put("/progress")  # type: ignore
 @app.input(ProgressRequest, location="json")
-def progress(json_data: dict[str, t.Any]) -> flask.Response:
-    jsn_user_program = json.loads(json_data["user_program"])
-    jsn_user_blocks = jsn_user_program["targets"][0]["blocks"]
-    user_program = load_program_from_block_descriptions(jsn_user_blocks)
-
-    solution_distances: list[dict[str, t.Any]] = []
-
-    solutions = json_data["solutions"]
-    for solution in solutions:
-        jsn_solution_program = json.loads(solution["program"])
-        jsn_solution_blocks = jsn_solution_program["targets"][0]["blocks"]
-        solution_program = load_program_from_block_descriptions(jsn_solution_blocks)
-        edit_script, distance = compute_edit_script_and_distance(
-            tree_from=user_program,
-            tree_to=solution_program,
-        )
-        solution_distances.append({
-            "id": solution["id"],
-            "distance": distance,
-            "edits": edit_script.to_dict(),
-        })
+@app.input(EditsQuery, location="query")
+def progress(
+    json_data: dict[str, t.Any],
+    query_data: dict[str, t.Any],
+) -> flask.Response:
+    user_program = _load_program_from_project(json_data["user_program"])
+    solutions = [
+        (solution["id"], _load_program_from_project(solution["program"]))
+        for solution in json_data["solutions"]
+    ]
+    solution_distances = progress_evaluator.evaluate(
+        user_program,
+        solutions,
+        include_edits=query_data["edits"],
+    )
+
+    response = flask.jsonify(solution_distances)
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+
+@app.put("/solutions")  # type: ignore
+@app.input(RegisterSolutionsRequest, location="json")
+def register_solutions(json_data: dict[str, t.Any]) -> flask.Response:
+    registered_ids: list[int] = []
+
+    for solution in json_data["solutions"]:
+        solution_registry.register(RegisteredSolution(
+            id_=solution["id"],
+            cmra_blocks_element_id=solution["cmra_blocks_element_id"],
+            weight=solution.get("weight"),
+            program=_load_program_from_project(solution["program"]),
+        ))
+        registered_ids.append(solution["id"])
+
+    response = flask.jsonify({"registered": registered_ids})
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+
+@app.put("/progress/registered")  # type: ignore
+@app.input(RegisteredProgressRequest, location="json")
+@app.input(EditsQuery, location="query")
+def progress_registered(
+    json_data: dict[str, t.Any],
+    query_data: dict[str, t.Any],
+) -> flask.Response:
+    solutions: list[RegisteredSolution] = []
+    for solution_id in json_data["solution_ids"]:
+        solution = solution_registry.get(solution_id)
+        if solution is None:
+            error = f"solution {solution_id} is not registered"
+            raise HTTPError(404, error)
+        solutions.append(solution)
+
+    user_program = _load_program_from_project(json_data["user_program"])
+    solution_distances = progress_evaluator.evaluate(
+        user_program,
+        [(solution.id_, solution.program) for solution in solutions],
+        include_edits=query_data["edits"],
+        in_process=True,
+    )
 
     response = flask.jsonify(solution_distances)
     response.headers.add("Access-Control-Allow-Origin", "*")
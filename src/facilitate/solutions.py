@@ -0,0 +1,61 @@
+"""Provides a bounded, in-memory registry of pre-parsed reference solutions."""
+from __future__ import annotations
+
+import threading
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+if t.TYPE_CHECKING:
+    from facilitate.model.program import Program
+
+
+@dataclass(frozen=True, kw_only=True)
+class RegisteredSolution:
+    """A reference solution whose program has already been parsed and preprocessed."""
+    id_: int
+    cmra_blocks_element_id: int
+    program: Program
+    weight: float | None = None
+
+
+@dataclass
+class SolutionRegistry:
+    """Stores reference solutions by their ID.
+
+    Once the registry holds max_size solutions, registering another solution evicts the least
+    recently used solution.
+    """
+    max_size: int = 256
+    _id_to_solution: OrderedDict[int, RegisteredSolution] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_size < 1:
+            error = f"registry must be able to store at least one solution (max_size: {self.max_size})"
+            raise ValueError(error)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._id_to_solution
+
+    def __len__(self) -> int:
+        return len(self._id_to_solution)
+
+    def register(self, solution: RegisteredSolution) -> None:
+        """Adds a solution to the registry, replacing any existing solution with the same ID."""
+        # the program is shared (without being copied) by all later requests that read it
+        solution.program.precompute_caches()
+
+        with self._lock:
+            self._id_to_solution[solution.id_] = solution
+            self._id_to_solution.move_to_end(solution.id_)
+            while len(self._id_to_solution) > self.max_size:
+                self._id_to_solution.popitem(last=False)
+
+    def get(self, id_: int) -> RegisteredSolution | None:
+        """Returns the solution with the given ID, or None if it is not registered."""
+        with self._lock:
+            solution = self._id_to_solution.get(id_)
+            if solution is not None:
+                self._id_to_solution.move_to_end(id_)
+            return solution
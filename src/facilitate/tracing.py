@@ -0,0 +1,88 @@
+"""Emits structured trace events (e.g., the duration of each phase of GumTree) as JSON lines.
+
+Tracing is disabled by default, in which case trace_phase does not measure or emit anything.
+It can be enabled via enable_tracing or by setting the FACILITATE_TRACE_FILE environment variable
+to the path of a file to which events should be appended.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+if t.TYPE_CHECKING:
+    import loguru
+
+_EVENT_KEY = "trace_event"
+
+
+@dataclass
+class _Settings:
+    sink_id: int | None = None
+
+
+_settings = _Settings()
+
+
+def tracing_enabled() -> bool:
+    """Determines whether trace events are being emitted."""
+    return _settings.sink_id is not None
+
+
+def enable_tracing(sink: t.TextIO) -> None:
+    """Writes each trace event to the given stream as a JSON object on its own line."""
+    disable_tracing()
+
+    def write_event(message: loguru.Message) -> None:
+        record = message.record
+        event = {"time": record["time"].timestamp(), **record["extra"][_EVENT_KEY]}
+        sink.write(json.dumps(event) + "\n")
+        sink.flush()
+
+    _settings.sink_id = logger.add(
+        write_event,
+        level="TRACE",
+        format="{message}",
+        filter=lambda record: _EVENT_KEY in record["extra"],
+    )
+
+
+def disable_tracing() -> None:
+    """Stops emitting trace events."""
+    if _settings.sink_id is not None:
+        with contextlib.suppress(ValueError):
+            logger.remove(_settings.sink_id)
+        _settings.sink_id = None
+
+
+def configure_tracing_from_environment() -> None:
+    """Enables tracing if the FACILITATE_TRACE_FILE environment variable is set."""
+    filename = os.environ.get("FACILITATE_TRACE_FILE")
+    if filename:
+        enable_tracing(Path(filename).open("a"))  # noqa: SIM115
+
+
+@contextlib.contextmanager
+def trace_phase(phase: str) -> t.Iterator[dict[str, t.Any]]:
+    """Measures the duration of a phase and emits it as a trace event.
+
+    Any fields (e.g., node counts) that are added to the yielded dictionary are included in the
+    event. If tracing is disabled, the phase is not measured and the fields are discarded.
+    """
+    fields: dict[str, t.Any] = {}
+    if _settings.sink_id is None:
+        yield fields
+        return
+
+    start = time.perf_counter()
+    yield fields
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    event = {"phase": phase, "duration_ms": duration_ms, **fields}
+    logger.bind(**{_EVENT_KEY: event}).trace("{} took {:.3f} ms", phase, duration_ms)
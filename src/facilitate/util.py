@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import traceback
 import typing as t
 import uuid
@@ -7,6 +8,10 @@ from pathlib import Path
 
 T = t.TypeVar("T")
 
+_LCS_SKIP_Y = 0
+_LCS_SKIP_X = 1
+_LCS_MATCH = 2
+
 
 def generate_id(prefix: str | None = None) -> str:
     id_ = f"{uuid.uuid4()!s}"
@@ -37,34 +42,80 @@ def longest_common_subsequence(
     ly: list[T],
     criteria: t.Callable[[T, T], bool],
 ) -> list[tuple[T, T]]:
-    """Finds the longest common subsequence within X and Y that satisfies a given criteria."""
+    """Finds the longest common subsequence within X and Y that satisfies a given criteria.
+
+    Only two rows of integer lengths are kept in memory, alongside a table that records a
+    single byte per cell, from which the subsequence is recovered by backtracking.
+    """
     m = len(lx)
     n = len(ly)
 
     if m == 0 or n == 0:
         return []
 
-    table: list[list[list[tuple[T, T]] | None]] = [
-        [None] * (n + 1) for i in range(m + 1)
-    ]
-
-    for i in range(m + 1):
-        for j in range(n + 1):
-            x = lx[i - 1]
-            y = ly[j - 1]
-            if i == 0 or j == 0:
-                table[i][j] = []
-            elif criteria(x, y):
-                prev = table[i - 1][j - 1]
-                assert prev is not None
-                table[i][j] = [*prev, (x, y)]
+    # directions[(i - 1) * n + (j - 1)] records how the subsequence for lx[:i] and ly[:j] was formed
+    directions = bytearray(m * n)
+    previous_row = [0] * (n + 1)
+
+    for i in range(1, m + 1):
+        x = lx[i - 1]
+        row = [0] * (n + 1)
+        offset = (i - 1) * n
+        for j in range(1, n + 1):
+            if criteria(x, ly[j - 1]):
+                row[j] = previous_row[j - 1] + 1
+                directions[offset + j - 1] = _LCS_MATCH
+            elif previous_row[j] > row[j - 1]:
+                row[j] = previous_row[j]
+                directions[offset + j - 1] = _LCS_SKIP_X
             else:
-                a = table[i - 1][j]
-                b = table[i][j - 1]
-                assert a is not None
-                assert b is not None
-                table[i][j] = a if len(a) > len(b) else b
-
-    result = table[m][n]
-    assert result is not None
+                row[j] = row[j - 1]
+                directions[offset + j - 1] = _LCS_SKIP_Y
+        previous_row = row
+
+    result: list[tuple[T, T]] = []
+    i, j = m, n
+    while i > 0 and j > 0:
+        direction = directions[(i - 1) * n + (j - 1)]
+        if direction == _LCS_MATCH:
+            result.append((lx[i - 1], ly[j - 1]))
+            i -= 1
+            j -= 1
+        elif direction == _LCS_SKIP_X:
+            i -= 1
+        else:
+            j -= 1
+    result.reverse()
+    return result
+
+
+def longest_increasing_subsequence(values: t.Sequence[int]) -> list[int]:
+    """Finds the positions of a longest strictly increasing subsequence of integers in O(n log n) time.
+
+    Ties between subsequences of equal length are broken in favor of later positions,
+    which matches the choice made by longest_common_subsequence.
+    """
+    # values are scanned from right to left: heads[k] is the position of the largest value
+    # that starts an increasing subsequence of length k + 1
+    heads: list[int] = []
+    negated_head_values: list[int] = []
+    successors: list[int | None] = [None] * len(values)
+
+    for position in range(len(values) - 1, -1, -1):
+        negated_value = -values[position]
+        k = bisect.bisect_left(negated_head_values, negated_value)
+        if k > 0:
+            successors[position] = heads[k - 1]
+        if k == len(heads):
+            heads.append(position)
+            negated_head_values.append(negated_value)
+        else:
+            heads[k] = position
+            negated_head_values[k] = negated_value
+
+    result: list[int] = []
+    maybe_position = heads[-1] if heads else None
+    while maybe_position is not None:
+        result.append(maybe_position)
+        maybe_position = successors[maybe_position]
     return result
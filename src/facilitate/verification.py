@@ -0,0 +1,82 @@
+"""Controls how thoroughly mappings and edit scripts are verified while they are computed.
+
+The verification level is read from the FACILITATE_VERIFICATION environment variable
+(one of "off", "hash", or "full"; "hash" by default) and can be changed via
+set_verification_level or overridden for a single call via the verification argument of
+compute_gumtree_mappings and compute_edit_script.
+"""
+from __future__ import annotations
+
+import enum
+import os
+import typing as t
+from dataclasses import dataclass
+
+if t.TYPE_CHECKING:
+    from facilitate.mappings import NodeMappings
+    from facilitate.model.node import Node
+
+
+class VerificationLevel(enum.Enum):
+    """Determines which checks are performed.
+
+    OFF performs no checks.
+    HASH checks that an edit script transforms one tree into the other by comparing their digests.
+    FULL also checks that mappings are one-to-one and compares both trees node by node.
+    """
+    OFF = "off"
+    HASH = "hash"
+    FULL = "full"
+
+    @classmethod
+    def from_environment(cls) -> VerificationLevel:
+        """Reads the verification level from the FACILITATE_VERIFICATION environment variable."""
+        value = os.environ.get("FACILITATE_VERIFICATION", cls.HASH.value)
+        try:
+            return cls(value.lower())
+        except ValueError:
+            levels = ", ".join(level.value for level in cls)
+            error = f"invalid verification level: {value} (expected one of: {levels})"
+            raise ValueError(error) from None
+
+
+class VerificationError(AssertionError):
+    """Raised when a verification check fails."""
+
+
+@dataclass
+class _Settings:
+    level: VerificationLevel
+
+
+_settings = _Settings(level=VerificationLevel.from_environment())
+
+
+def get_verification_level() -> VerificationLevel:
+    """Returns the default verification level."""
+    return _settings.level
+
+
+def set_verification_level(level: VerificationLevel | str) -> None:
+    """Changes the default verification level."""
+    _settings.level = VerificationLevel(level)
+
+
+def resolve_verification_level(level: VerificationLevel | None) -> VerificationLevel:
+    """Returns the given verification level, or the default level if none is given."""
+    return _settings.level if level is None else level
+
+
+def verify_mappings(mappings: NodeMappings, level: VerificationLevel) -> None:
+    """Checks that the given mappings are one-to-one, if the verification level is FULL."""
+    if level is VerificationLevel.FULL:
+        mappings.check()
+
+
+def verify_equivalent(tree_from: Node, tree_to: Node, level: VerificationLevel) -> None:
+    """Checks that two trees are equivalent to the extent required by the verification level."""
+    if level is VerificationLevel.OFF:
+        return
+    if not tree_from.equivalent_to(tree_to, deep=level is VerificationLevel.FULL):
+        error = f"trees are not equivalent (verification: {level.value})"
+        raise VerificationError(error)
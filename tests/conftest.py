@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 
 from facilitate.loader import load_from_file
+from facilitate.verification import VerificationLevel, set_verification_level
 
 if t.TYPE_CHECKING:
     from facilitate.model.node import Node
@@ -20,6 +21,11 @@ _MINIMAL_EXAMPLE_PATH = _EXAMPLES_DIR / "minimal.json"
 _MINIMAL_WITH_EXTRA_EXAMPLE_PATH = _EXAMPLES_DIR / "minimal_with_extra.json"
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _full_verification() -> None:
+    set_verification_level(VerificationLevel.FULL)
+
+
 @pytest.fixture()
 def good_tree() -> Node:
     return load_from_file(_GOOD_EXAMPLE_PATH)
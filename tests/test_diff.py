@@ -113,3 +113,29 @@ def test_diff_minimal_trees(minimal_tree: Node, minimal_with_extra_tree: Node) -
     tree_from = minimal_tree
     tree_to = minimal_with_extra_tree
     compute_edit_script(tree_from, tree_to)
+
+
+def test_diff_does_not_modify_trees(good_tree: Node, bad_tree: Node) -> None:
+    tree_from = bad_tree
+    tree_to = good_tree
+    from_digest = tree_from.digest
+    to_digest = tree_to.digest
+    to_nodes = list(tree_to.nodes())
+
+    compute_edit_script(tree_from, tree_to)
+
+    assert tree_from.digest == from_digest
+    assert tree_to.digest == to_digest
+    assert list(tree_to.nodes()) == to_nodes
+    assert all(not node.tags for node in tree_to.nodes())
+
+
+def test_diff_does_not_write_to_prepared_target(good_tree: Node, bad_tree: Node) -> None:
+    tree_to = good_tree
+    tree_to.precompute_caches()
+    caches = [(node._digest, node._numbering, node._preorder_start) for node in tree_to.nodes()]
+
+    compute_edit_script(bad_tree, tree_to)
+
+    assert tree_to.is_numbered()
+    assert [(node._digest, node._numbering, node._preorder_start) for node in tree_to.nodes()] == caches
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from facilitate.distance import compute_distance_only, compute_edit_script_and_distance
+from facilitate.model.program import Program
+
+
+@pytest.mark.parametrize(
+    ("tree_from_name", "tree_to_name"),
+    list(itertools.permutations(["good_tree", "bad_tree", "ugly_tree", "minimal_tree"], 2)),
+)
+def test_distance_only_matches_edit_script_distance(
+    tree_from_name: str,
+    tree_to_name: str,
+    request: pytest.FixtureRequest,
+) -> None:
+    tree_from: Program = request.getfixturevalue(tree_from_name)
+    tree_to: Program = request.getfixturevalue(tree_to_name)
+    tree_from_digest = tree_from.digest
+
+    _, expected_distance = compute_edit_script_and_distance(tree_from, tree_to)
+    actual_distance = compute_distance_only(tree_from, tree_to)
+
+    assert actual_distance == expected_distance
+
+    # computing the distance should have no side effects
+    assert tree_from.digest == tree_from_digest
@@ -3,11 +3,14 @@ import pytest
 from pathlib import Path
 
 from facilitate.gumtree import (
+    HeightIndexedPriorityList,
+    compute_bottom_up_mappings,
     compute_gumtree_mappings,
+    compute_id_mappings,
     compute_topdown_mappings,
     dice,
 )
-from facilitate.loader import load_from_file
+from facilitate.loader import load_from_file, load_program_from_block_descriptions
 from facilitate.mappings import NodeMappings
 from facilitate.model.node import Node
 
@@ -75,6 +78,14 @@ def test_dice(good_tree: Node, bad_tree: Node) -> None:
     mappings.add_with_descendants(input_from, input_to)
 
     assert dice(input_from, input_to, mappings) == 1.0
+    program_score = dice(bad_tree, good_tree, mappings)
+    assert program_score > 0
+
+    # the score is the same when computed via the preorder numbering of each tree
+    good_tree.number_nodes()
+    bad_tree.number_nodes()
+    assert dice(input_from, input_to, mappings) == 1.0
+    assert dice(bad_tree, good_tree, mappings) == program_score
 
 
 # FIXME fails non-deterministically!
@@ -94,3 +105,124 @@ def test_topdown_mappings(good_tree: Node, bad_tree: Node) -> None:
     assert x.equivalent_to(y)
     assert dice(x, y, mappings) == 1.0
     assert (x, y) in mappings
+
+
+def test_height_indexed_priority_list(good_tree: Node) -> None:
+    hlist = HeightIndexedPriorityList()
+    assert hlist.max_height == 0
+    assert hlist.pop() == []
+
+    nodes = list(good_tree.nodes())
+    for node in nodes:
+        hlist.push(node)
+    assert hlist.max_height == good_tree.height
+
+    popped: list[Node] = []
+    previous_height = good_tree.height + 1
+    while hlist.max_height > 0:
+        height = hlist.max_height
+        assert height < previous_height
+        max_height_nodes = hlist.pop()
+        assert all(node.height == height for node in max_height_nodes)
+        popped += max_height_nodes
+        previous_height = height
+
+    assert hlist.pop() == []
+    assert sorted(node.id_ for node in popped) == sorted(node.id_ for node in nodes)
+
+
+def _build_move_blocks_program(steps: list[str]) -> Node:
+    length = len(steps)
+    descriptions = {
+        f"move-{position}": {
+            "opcode": "motion_movesteps",
+            "next": f"move-{position + 1}" if position + 1 < length else None,
+            "parent": f"move-{position - 1}" if position > 0 else None,
+            "inputs": {"STEPS": [1, [4, steps[position]]]},
+            "fields": {},
+            "shadow": False,
+            "topLevel": position == 0,
+        }
+        for position in range(length)
+    }
+    return load_program_from_block_descriptions(descriptions)
+
+
+def _build_identical_blocks_program(length: int) -> Node:
+    return _build_move_blocks_program(["10"] * length)
+
+
+def test_topdown_mappings_with_identical_blocks() -> None:
+    tree_from = _build_identical_blocks_program(20)
+    tree_to = _build_identical_blocks_program(21)
+
+    mappings = compute_topdown_mappings(tree_from, tree_to)
+    mappings.check()
+
+    # each block, along with its input and literal, is mapped exactly once
+    assert len(mappings) == 20 * 3
+
+
+def test_bottom_up_mappings_match_containers_with_common_descendants() -> None:
+    tree_from = _build_identical_blocks_program(3)
+    tree_to = _build_identical_blocks_program(4)
+    sequence_from = next(iter(tree_from.children()))
+    sequence_to = next(iter(tree_to.children()))
+
+    mappings = compute_topdown_mappings(tree_from, tree_to)
+    assert not mappings.source_is_mapped(sequence_from)
+
+    mappings = compute_bottom_up_mappings(tree_from, tree_to, mappings)
+    mappings.check()
+    assert mappings.source_is_mapped_to(sequence_from) is sequence_to
+
+
+def test_bottom_up_mappings_recover_unmatched_descendants() -> None:
+    tree_from = _build_move_blocks_program(["10", "20", "30"])
+    tree_to = _build_move_blocks_program(["10", "20", "99"])
+    block_from = tree_from.find("move-2")
+    block_to = tree_to.find("move-2")
+
+    # without recovery, the block whose literal has changed remains unmatched
+    mappings = compute_gumtree_mappings(tree_from, tree_to, max_size=0)
+    assert not mappings.source_is_mapped(block_from)
+
+    mappings = compute_gumtree_mappings(tree_from, tree_to)
+    mappings.check()
+    assert mappings.source_is_mapped_to(block_from) is block_to
+    literal_from = block_from.find_input("STEPS").expression
+    literal_to = block_to.find_input("STEPS").expression
+    assert mappings.source_is_mapped_to(literal_from) is literal_to
+
+
+def test_id_mappings_map_blocks_by_id() -> None:
+    tree_from = _build_move_blocks_program(["10", "20", "30"])
+    tree_to = _build_move_blocks_program(["10", "20", "99", "40"])
+
+    mappings = compute_id_mappings(tree_from, tree_to)
+    mappings.check()
+
+    for id_ in ("move-0", "move-1", "move-2"):
+        block_from = tree_from.find(id_)
+        block_to = tree_to.find(id_)
+        assert mappings.source_is_mapped_to(block_from) is block_to
+        input_from = block_from.find_input("STEPS")
+        input_to = block_to.find_input("STEPS")
+        assert mappings.source_is_mapped_to(input_from) is input_to
+        assert mappings.source_is_mapped_to(input_from.expression) is input_to.expression
+
+    assert not mappings.destination_is_mapped(tree_to.find("move-3"))
+
+
+def test_gumtree_mappings_with_matched_ids() -> None:
+    tree_from = _build_identical_blocks_program(20)
+    tree_to = _build_identical_blocks_program(21)
+
+    mappings = compute_gumtree_mappings(tree_from, tree_to, match_ids=True)
+    mappings.check()
+
+    # identical blocks are mapped to the block with the same ID, rather than by their dice score
+    for position in range(20):
+        id_ = f"move-{position}"
+        assert mappings.source_is_mapped_to(tree_from.find(id_)) is tree_to.find(id_)
+    assert not mappings.destination_is_mapped(tree_to.find("move-20"))
@@ -47,3 +47,19 @@ def test_add_nodes_with_different_types(tree_before: Node, tree_after: Node) ->
 
     with pytest.raises(TypeError):
         mappings.add(node_before, node_after)
+
+
+def test_copy_and_check(tree_before: Node, tree_after: Node) -> None:
+    mappings = NodeMappings()
+    copied_tree = tree_after.copy()
+
+    copied_mappings = mappings.copy()
+    copied_mappings.add(tree_before, copied_tree)
+    assert (tree_before, copied_tree) in copied_mappings
+    assert copied_mappings.destination_is_mapped_to(copied_tree) is tree_before
+    assert not mappings.source_is_mapped(tree_before)
+
+    # mapping two sources to the same destination is caught by check
+    copied_mappings.add(tree_after, copied_tree)
+    with pytest.raises(ValueError, match="already mapped"):
+        copied_mappings.check()
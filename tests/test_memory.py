@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from facilitate import loader
+from facilitate.loader import load_from_file
+from facilitate.model.program import Program
+
+_PATH_TESTS = Path(__file__).parent
+_PATH_EXAMPLES = _PATH_TESTS.parent / "examples"
+_PATH_PROGRAMS = _PATH_TESTS / "resources" / "programs"
+
+_NUM_LOADS = 5
+
+# interning the strings of repeatedly loaded programs saves roughly an eighth of their memory
+_MAX_INTERNED_TO_UNINTERNED_RATIO = 0.95
+
+
+def _corpus_files() -> list[Path]:
+    return sorted(_PATH_EXAMPLES.glob("*.json")) + sorted(_PATH_PROGRAMS.glob("**/*.json"))
+
+
+def _measure_bytes_per_node(files: list[Path]) -> float:
+    """Loads each file several times and returns the memory retained by the programs per node."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        memory_before, _ = tracemalloc.get_traced_memory()
+        programs = [load_from_file(file) for _ in range(_NUM_LOADS) for file in files]
+        gc.collect()
+        memory_after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    num_nodes = sum(program.size() for program in programs)
+    return (memory_after - memory_before) / num_nodes
+
+
+def test_nodes_have_no_instance_dict(good_tree: Program) -> None:
+    for node in good_tree.nodes():
+        assert not hasattr(node, "__dict__"), type(node).__name__
+
+
+def test_memory_per_node(
+    monkeypatch: pytest.MonkeyPatch,
+    record_property: t.Callable[[str, object], None],
+) -> None:
+    files = _corpus_files()
+    # load each file once beforehand, so that module-level allocations are not measured
+    for file in files:
+        load_from_file(file)
+
+    bytes_per_node = _measure_bytes_per_node(files)
+    with monkeypatch.context() as patch:
+        patch.setattr(loader, "_intern", lambda value: value)
+        uninterned_bytes_per_node = _measure_bytes_per_node(files)
+
+    record_property("bytes_per_node", bytes_per_node)
+    record_property("uninterned_bytes_per_node", uninterned_bytes_per_node)
+    assert bytes_per_node <= _MAX_INTERNED_TO_UNINTERNED_RATIO * uninterned_bytes_per_node
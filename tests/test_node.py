@@ -1,6 +1,15 @@
 
 
+import subprocess
+import sys
+from itertools import product
+
+from facilitate.algorithms import breadth_first_search
+from facilitate.diff import delete_phase, update_insert_align_move_phase
+from facilitate.edit import Update
+from facilitate.gumtree import compute_gumtree_mappings
 from facilitate.model.node import Node
+from facilitate.model.tag import Tag
 
 
 def test_copy(good_tree: Node) -> None:
@@ -10,6 +19,46 @@ def test_copy(good_tree: Node) -> None:
     assert good_tree.equivalent_to(copied_tree)
 
 
+def _recursively_equivalent(node_x: Node, node_y: Node) -> bool:
+    if type(node_x) is not type(node_y) or not node_x.surface_equivalent_to(node_y):
+        return False
+    children_x = list(node_x.children())
+    children_y = list(node_y.children())
+    if len(children_x) != len(children_y):
+        return False
+    return all(map(_recursively_equivalent, children_x, children_y))
+
+
+def test_digest_matches_deep_equivalence(good_tree: Node, bad_tree: Node) -> None:
+    nodes = [*good_tree.nodes(), *bad_tree.nodes()]
+    for node_x, node_y in product(good_tree.nodes(), nodes):
+        same_digest = node_x.digest == node_y.digest
+        assert same_digest == _recursively_equivalent(node_x, node_y)
+        assert same_digest == node_x.equivalent_to(node_y, deep=True)
+
+
+def test_digest_is_invalidated_by_update(good_tree: Node) -> None:
+    copied_tree = good_tree.copy()
+    assert copied_tree.digest == good_tree.digest
+
+    literal = next(node for node in copied_tree.nodes() if node.__class__.__name__ == "Literal")
+    Update(node_id=literal.id_, value="facilitate").apply(copied_tree)
+    assert copied_tree.digest != good_tree.digest
+    assert not copied_tree.equivalent_to(good_tree)
+
+
+def test_copy_keeps_cached_digest(good_tree: Node) -> None:
+    digest = good_tree.digest
+    copied_tree = good_tree.copy()
+    assert all(node._digest is not None for node in copied_tree.nodes())
+    assert copied_tree.digest == digest
+
+    literal = next(node for node in copied_tree.nodes() if node.__class__.__name__ == "Literal")
+    Update(node_id=literal.id_, value="facilitate").apply(copied_tree)
+    assert copied_tree.digest != digest
+    assert good_tree.digest == digest
+
+
 def test_height(good_tree: Node) -> None:
     node = good_tree.find("0z(.tYRa{!SepmI$)#U,").find_input("DIRECTION")
     assert node is not None
@@ -44,3 +93,139 @@ def test_parent(good_tree: Node) -> None:
 def test_size(good_tree: Node) -> None:
     node = good_tree.find("0z(.tYRa{!SepmI$)#U,")
     assert node.size() == 4
+
+
+def _assert_heights_and_sizes_are_correct(tree: Node) -> None:
+    for node in tree.postorder():
+        expected_height = 1 + max((child.height for child in node.children()), default=0)
+        expected_size = 1 + sum(child.size() for child in node.children())
+        assert node.height == expected_height, node.id_
+        assert node.size() == expected_size, node.id_
+
+
+def test_height_and_size_are_maintained_by_mutation(bad_tree: Node, good_tree: Node) -> None:
+    tree_from = bad_tree.copy()
+    _assert_heights_and_sizes_are_correct(tree_from)
+
+    mappings = compute_gumtree_mappings(tree_from, good_tree)
+    script = update_insert_align_move_phase(tree_from, good_tree, mappings)
+    _assert_heights_and_sizes_are_correct(tree_from)
+
+    delete_phase(script, tree_from, mappings)
+    _assert_heights_and_sizes_are_correct(tree_from)
+    assert tree_from.height == good_tree.height
+    assert tree_from.size() == good_tree.size()
+
+
+def test_find_uses_index_consistent_with_mutations(bad_tree: Node, good_tree: Node) -> None:
+    tree_from = bad_tree.copy()
+    mappings = compute_gumtree_mappings(tree_from, good_tree)
+    script = update_insert_align_move_phase(tree_from, good_tree, mappings)
+    delete_phase(script, tree_from, mappings)
+
+    nodes = list(tree_from.nodes())
+    assert len(tree_from._node_index()) == len(nodes)
+    for node in nodes:
+        assert tree_from.find(node.id_) is node
+
+
+def test_numbering_agrees_with_traversal(good_tree: Node) -> None:
+    nodes = list(good_tree.nodes())
+    expected = {(x.id_, y.id_) for x, y in product(nodes, nodes) if y in x.descendants()}
+
+    good_tree.number_nodes()
+    assert all(node.is_numbered() for node in nodes)
+    assert all(node.numbered_descendants() == list(node.descendants()) for node in nodes)
+    assert {(x.id_, y.id_) for x, y in product(nodes, nodes) if x.contains(y)} == expected
+
+
+def test_numbering_is_invalidated_by_mutation(bad_tree: Node, good_tree: Node) -> None:
+    tree_from = bad_tree.copy()
+    mappings = compute_gumtree_mappings(tree_from, good_tree)
+    assert tree_from.is_numbered()
+
+    script = update_insert_align_move_phase(tree_from, good_tree, mappings)
+    delete_phase(script, tree_from, mappings)
+    assert not tree_from.is_numbered()
+
+    nodes = list(tree_from.nodes())
+    for x, y in product(nodes, nodes):
+        assert x.contains(y) == (y in x.descendants())
+
+
+def _recursive_preorder(node: Node) -> list[Node]:
+    nodes = [node]
+    for child in node.children():
+        nodes += _recursive_preorder(child)
+    return nodes
+
+
+def _recursive_postorder(node: Node) -> list[Node]:
+    nodes: list[Node] = []
+    for child in node.children():
+        nodes += _recursive_postorder(child)
+    return [*nodes, node]
+
+
+def test_traversals(good_tree: Node, ugly_tree: Node) -> None:
+    for tree in (good_tree, ugly_tree):
+        expected_preorder = _recursive_preorder(tree)
+        assert list(tree.nodes()) == expected_preorder
+        assert list(tree.descendants()) == expected_preorder[1:]
+        assert list(tree.postorder()) == _recursive_postorder(tree)
+        assert list(breadth_first_search(tree))[0] is tree
+
+        # once numbered, the numbering is used as a cached preorder
+        tree.number_nodes()
+        assert list(tree.nodes()) == expected_preorder
+        for node in expected_preorder:
+            assert list(node.nodes()) == _recursive_preorder(node)
+
+
+def test_renumbering_subtree_invalidates_numbering(good_tree: Node) -> None:
+    good_tree.number_nodes()
+    subtree = next(good_tree.descendants())
+    subtree.number_nodes()
+    assert subtree.is_numbered()
+    assert not good_tree.is_numbered()
+    assert list(good_tree.nodes()) == _recursive_preorder(good_tree)
+
+
+def test_tags(good_tree: Node) -> None:
+    node = good_tree.top_level_nodes[0].blocks[0]
+    assert node.tag_flags == Tag.NONE
+    assert len(node.tags) == 0
+
+    node.tags.append("MOVED")
+    node.add_tag(Tag.ADDED)
+    node.add_tag("MOVED")
+    assert node.tag_flags == Tag.ADDED | Tag.MOVED
+    assert node.has_tag("ADDED")
+    assert "MOVED" in node.tags
+    assert "UPDATED" not in node.tags
+    assert node.tags == ["ADDED", "MOVED"]
+
+    copied_node = node.copy()
+    assert copied_node.tags == ["ADDED", "MOVED"]
+    copied_node.tags = ["DELETED"]
+    assert copied_node.tag_flags == Tag.DELETED
+    assert node.tag_flags == Tag.ADDED | Tag.MOVED
+
+
+def test_add_tag_to_subtree(good_tree: Node) -> None:
+    good_tree.add_tag_to_subtree("UPDATED")
+    assert all(node.has_tag(Tag.UPDATED) for node in good_tree.nodes())
+
+
+def test_visualization_dependencies_are_imported_lazily() -> None:
+    program = (
+        "import sys; import facilitate.distance; "
+        "print(any(name in sys.modules for name in ('networkx', 'PIL.Image', 'pydot')))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", program],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+    assert output == "False"
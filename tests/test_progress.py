@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from facilitate.model.node import Node
+from facilitate.progress import ProgressEvaluator
+
+
+def test_parallel_evaluation_preserves_order(
+    bad_tree: Node,
+    good_tree: Node,
+    ugly_tree: Node,
+    minimal_tree: Node,
+) -> None:
+    solutions = [(1, good_tree), (2, ugly_tree), (3, minimal_tree), (4, bad_tree)]
+
+    serial = ProgressEvaluator(workers=1).evaluate(bad_tree, solutions)
+
+    evaluator = ProgressEvaluator(workers=2)
+    try:
+        parallel = evaluator.evaluate(bad_tree, solutions)
+    finally:
+        evaluator.shutdown()
+
+    assert [progress["id"] for progress in parallel] == [1, 2, 3, 4]
+    assert [progress["distance"] for progress in parallel] == [progress["distance"] for progress in serial]
+    assert parallel[3]["distance"] == 0
+
+
+def test_evaluation_without_edits(
+    bad_tree: Node,
+    good_tree: Node,
+) -> None:
+    evaluator = ProgressEvaluator(workers=1)
+    with_edits = evaluator.evaluate(bad_tree, [(1, good_tree)])
+    without_edits = evaluator.evaluate(bad_tree, [(1, good_tree)], include_edits=False)
+
+    assert "edits" in with_edits[0]
+    assert without_edits == [{"id": 1, "distance": with_edits[0]["distance"]}]
+
+
+def test_in_process_evaluation_does_not_use_workers(
+    bad_tree: Node,
+    good_tree: Node,
+) -> None:
+    evaluator = ProgressEvaluator(workers=2)
+    try:
+        in_process = evaluator.evaluate(bad_tree, [(1, good_tree), (2, bad_tree)], in_process=True)
+        assert evaluator._executor is None
+    finally:
+        evaluator.shutdown()
+
+    assert [progress["id"] for progress in in_process] == [1, 2]
+    assert in_process[1]["distance"] == 0
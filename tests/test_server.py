@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import typing as t
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from facilitate.server import app
+
+if t.TYPE_CHECKING:
+    from flask.testing import FlaskClient
+
+_PATH_EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def _project(example_name: str) -> str:
+    with (_PATH_EXAMPLES / f"{example_name}.json").open() as fh:
+        blocks = json.load(fh)
+    return json.dumps({"targets": [{"blocks": blocks}]})
+
+
+@pytest.fixture()
+def client() -> FlaskClient:
+    return app.test_client()
+
+
+def test_progress_towards_registered_solutions(client: FlaskClient) -> None:
+    response = client.put("/solutions", json={
+        "solutions": [
+            {"id": 1, "cmra_blocks_element_id": 7, "program": _project("good")},
+            {"id": 2, "cmra_blocks_element_id": 7, "program": _project("bad")},
+        ],
+    })
+    assert response.status_code == 200
+    assert response.json == {"registered": [1, 2]}
+
+    response = client.put("/progress/registered", json={
+        "user_program": _project("bad"),
+        "solution_ids": [1, 2],
+    })
+    assert response.status_code == 200
+    assert [progress["id"] for progress in response.json] == [1, 2]
+    assert response.json[1]["distance"] == 0
+
+
+def test_progress_towards_unregistered_solution(client: FlaskClient) -> None:
+    response = client.put("/progress/registered", json={
+        "user_program": _project("bad"),
+        "solution_ids": [404],
+    })
+    assert response.status_code == 404
+
+
+def test_progress_towards_registered_solutions_requires_user_program(client: FlaskClient) -> None:
+    response = client.put("/solutions", json={
+        "solutions": [{"id": 3, "cmra_blocks_element_id": 7, "program": _project("good")}],
+    })
+    assert response.status_code == 200
+
+    response = client.put("/progress/registered", json={"solution_ids": [3]})
+    assert response.status_code == 422
+
+
+def test_server_does_not_format_debug_messages() -> None:
+    formatted: list[str] = []
+
+    class Argument:
+        def __str__(self) -> str:
+            formatted.append("argument")
+            return "argument"
+
+    logger.debug("argument: {}", Argument())
+    assert not formatted
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from facilitate.model.node import Node
+from facilitate.solutions import RegisteredSolution, SolutionRegistry
+
+
+def _solution(id_: int, program: Node) -> RegisteredSolution:
+    return RegisteredSolution(
+        id_=id_,
+        cmra_blocks_element_id=1,
+        program=program,
+    )
+
+
+def test_register_and_get(good_tree: Node, bad_tree: Node) -> None:
+    registry = SolutionRegistry()
+    registry.register(_solution(1, good_tree))
+    assert 1 in registry
+    assert registry.get(1).program is good_tree
+    assert registry.get(2) is None
+
+    # registering a solution with the same ID replaces it
+    registry.register(_solution(1, bad_tree))
+    assert len(registry) == 1
+    assert registry.get(1).program is bad_tree
+
+
+def test_least_recently_used_solution_is_evicted(good_tree: Node) -> None:
+    registry = SolutionRegistry(max_size=2)
+    registry.register(_solution(1, good_tree))
+    registry.register(_solution(2, good_tree))
+
+    # using solution 1 makes solution 2 the least recently used
+    assert registry.get(1) is not None
+    registry.register(_solution(3, good_tree))
+
+    assert len(registry) == 2
+    assert 1 in registry
+    assert 2 not in registry
+    assert 3 in registry
+
+
+def test_registry_must_have_capacity() -> None:
+    with pytest.raises(ValueError):
+        SolutionRegistry(max_size=0)
@@ -0,0 +1,56 @@
+import io
+import json
+
+from facilitate.diff import compute_edit_script
+from facilitate.model.node import Node
+from facilitate.tracing import disable_tracing, enable_tracing, trace_phase, tracing_enabled
+
+
+def _read_events(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_trace_phase_when_disabled() -> None:
+    assert not tracing_enabled()
+    with trace_phase("test") as event:
+        event["count"] = 1
+
+
+def test_trace_phase() -> None:
+    stream = io.StringIO()
+    enable_tracing(stream)
+    try:
+        with trace_phase("test") as event:
+            event["count"] = 3
+    finally:
+        disable_tracing()
+
+    with trace_phase("test") as event:
+        event["count"] = 4
+
+    events = _read_events(stream)
+    assert len(events) == 1
+    assert events[0]["phase"] == "test"
+    assert events[0]["count"] == 3
+    assert events[0]["duration_ms"] >= 0
+
+
+def test_edit_script_phases_are_traced(good_tree: Node, bad_tree: Node) -> None:
+    stream = io.StringIO()
+    enable_tracing(stream)
+    try:
+        script = compute_edit_script(bad_tree, good_tree)
+    finally:
+        disable_tracing()
+
+    phase_to_event = {event["phase"]: event for event in _read_events(stream)}
+    assert list(phase_to_event) == [
+        "gumtree.top-down",
+        "gumtree.bottom-up",
+        "diff.update-insert-align-move",
+        "diff.delete",
+        "diff.verify",
+    ]
+    assert phase_to_event["gumtree.top-down"]["nodes_x"] == bad_tree.size()
+    assert phase_to_event["gumtree.top-down"]["nodes_y"] == good_tree.size()
+    assert phase_to_event["diff.delete"]["edits"] == len(script)
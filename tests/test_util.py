@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from facilitate.util import longest_common_subsequence, longest_increasing_subsequence
+
+
+def _is_subsequence(subsequence: list[str], sequence: list[str]) -> bool:
+    remaining = iter(sequence)
+    return all(item in remaining for item in subsequence)
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 5, 10, 20])
+def test_longest_increasing_subsequence_matches_lcs_of_permutation(size: int) -> None:
+    rng = random.Random(size)
+    for _ in range(50):
+        permutation = list(range(size))
+        rng.shuffle(permutation)
+
+        expected = [y for (_, y) in longest_common_subsequence(
+            list(range(size)),
+            permutation,
+            lambda x, y: x == y,
+        )]
+        actual = [permutation[position] for position in longest_increasing_subsequence(permutation)]
+
+        assert actual == expected
+
+
+def test_longest_common_subsequence() -> None:
+    lx = list("ABCBDAB")
+    ly = list("BDCABA")
+
+    lcs = longest_common_subsequence(lx, ly, lambda x, y: x == y)
+
+    assert len(lcs) == 4  # noqa: PLR2004
+    assert all(x == y for (x, y) in lcs)
+    assert _is_subsequence([x for (x, _) in lcs], lx)
+    assert _is_subsequence([y for (_, y) in lcs], ly)
+
+
+def test_longest_common_subsequence_of_long_sequences() -> None:
+    size = 1000
+    lx = list(range(size))
+    ly = [value for value in range(size) if value % 3 != 0]
+
+    lcs = longest_common_subsequence(lx, ly, lambda x, y: x == y)
+
+    assert [x for (x, _) in lcs] == ly
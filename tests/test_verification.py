@@ -0,0 +1,54 @@
+import pytest
+
+from facilitate.diff import compute_edit_script
+from facilitate.model.node import Node
+from facilitate.verification import (
+    VerificationError,
+    VerificationLevel,
+    get_verification_level,
+    set_verification_level,
+    verify_equivalent,
+)
+
+
+def test_verification_level_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("FACILITATE_VERIFICATION", raising=False)
+    assert VerificationLevel.from_environment() == VerificationLevel.HASH
+
+    monkeypatch.setenv("FACILITATE_VERIFICATION", "OFF")
+    assert VerificationLevel.from_environment() == VerificationLevel.OFF
+
+    monkeypatch.setenv("FACILITATE_VERIFICATION", "sometimes")
+    with pytest.raises(ValueError):
+        VerificationLevel.from_environment()
+
+
+def test_set_verification_level() -> None:
+    level = get_verification_level()
+    try:
+        set_verification_level("off")
+        assert get_verification_level() == VerificationLevel.OFF
+    finally:
+        set_verification_level(level)
+
+
+@pytest.mark.parametrize("level", [VerificationLevel.HASH, VerificationLevel.FULL])
+def test_verify_equivalent(good_tree: Node, bad_tree: Node, level: VerificationLevel) -> None:
+    verify_equivalent(good_tree, good_tree.copy(), level)
+    with pytest.raises(VerificationError):
+        verify_equivalent(good_tree, bad_tree, level)
+
+
+def test_verification_off(good_tree: Node, bad_tree: Node) -> None:
+    verify_equivalent(good_tree, bad_tree, VerificationLevel.OFF)
+
+
+@pytest.mark.parametrize("level", list(VerificationLevel))
+def test_edit_script_at_each_verification_level(
+    good_tree: Node,
+    bad_tree: Node,
+    level: VerificationLevel,
+) -> None:
+    expected = compute_edit_script(bad_tree, good_tree, verification=VerificationLevel.FULL)
+    script = compute_edit_script(bad_tree, good_tree, verification=level)
+    assert len(script) == len(expected)